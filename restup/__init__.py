@@ -3,4 +3,7 @@ __license__ = 'BSD'
 __version__ = (0, 1, 0)
 
 
+default_app_config = 'restup.apps.RestUpConfig'
+
 from .resources import ModelResource
+from .api import Api
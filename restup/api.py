@@ -0,0 +1,114 @@
+import logging
+import time
+from collections import OrderedDict
+
+from django.conf.urls import url, include
+
+from .utils import cache_uri_template
+
+
+logger = logging.getLogger('restup')
+
+# Every Api instance ever created. The app config walks this list once the
+# app registry is ready in order to precompile all registered resources.
+registry = []
+
+
+class Api(object):
+    """
+    A collection of resources that are served together. The Api generates the
+    url patterns for all of its resources and precompiles them at startup so
+    that the first requests a worker handles don't pay for it.
+
+    **Example:**
+
+        api = Api()
+        api.register(BookResource, 'books')
+
+        urlpatterns = [
+            url(r'^api/', include(api.urls)),
+        ]
+    """
+
+    def __init__(self, name='api'):
+        self.name = name
+        self._registry = OrderedDict()
+        self.timings = OrderedDict()
+        registry.append(self)
+
+    def register(self, resource, prefix=None):
+        """
+        Adds a resource to the Api.
+
+        :param resource: A <ModelResource> subclass.
+
+        :param prefix: The url prefix the resource is served under. Defaults
+        to the plural verbose name of the resource's model.
+        :type prefix: str
+
+        :return: The resource, so this can also be used as a class decorator.
+        """
+        if prefix is None:
+            prefix = str(resource.model._meta.verbose_name_plural)
+            prefix = prefix.replace(' ', '-').lower()
+        self._registry[prefix.strip('/')] = resource
+        return resource
+
+    @property
+    def resources(self):
+        return list(self._registry.values())
+
+    @property
+    def urls(self):
+        """
+        The url patterns for every registered resource.
+
+        :return: A list of url route configuration objects.
+        :type return: list
+        """
+        return [
+            url(
+                r'^{prefix}/'.format(prefix=prefix),
+                include(resource.urls())
+            )
+            for prefix, resource in self._registry.items()
+        ]
+
+    def compile(self):
+        """
+        Precompiles the schema plan of every registered resource and records
+        how long each one took.
+
+        :return: A dict of resource class names to compile time in seconds.
+        :type return: dict
+        """
+        for resource in self.resources:
+            start = time.perf_counter()
+            resource.compile()
+            elapsed = time.perf_counter() - start
+            self.timings[resource.__name__] = elapsed
+            logger.debug(
+                "%s: compiled %s in %.2fms",
+                self.name, resource.__name__, elapsed * 1000
+            )
+        logger.info(
+            "%s: compiled %d resources in %.2fms",
+            self.name, len(self.timings), sum(self.timings.values()) * 1000
+        )
+        return self.timings
+
+    def warmup(self):
+        """
+        Does everything `compile` does and also loads the URLconf and caches
+        the detail URI template of every registered resource. This needs the
+        URLconf to be importable so it is not part of the default startup.
+
+        :return: A dict of resource class names to warmup time in seconds.
+        :type return: dict
+        """
+        self.compile()
+        for resource in self.resources:
+            start = time.perf_counter()
+            cache_uri_template(resource.get_plan().viewnames['detail'])
+            self.timings[resource.__name__] += time.perf_counter() - start
+        return self.timings
@@ -0,0 +1,35 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+from .conf import get_setting
+
+
+class RestUpConfig(AppConfig):
+
+    name = 'restup'
+    verbose_name = 'RestUp'
+
+    def ready(self):
+        """
+        Imports the `api` module of every installed app so that their Api
+        instances get created, then precompiles every registered resource.
+        Also registers the RestUp system checks.
+        With `RESTUP_WARMUP` enabled the URI templates are cached as well.
+
+        Resources with a change feed or a signal driven search index are
+        always compiled, registered or not, so that writes from the admin,
+        management commands or task workers are recorded too.
+        """
+        from .api import registry
+        from .checks import resource_classes
+
+        if get_setting('RESTUP_AUTODISCOVER'):
+            autodiscover_modules('api')
+        for api in registry:
+            if get_setting('RESTUP_WARMUP'):
+                api.warmup()
+            elif get_setting('RESTUP_PRECOMPILE'):
+                api.compile()
+        for resource in resource_classes():
+            if resource.uses_signals():
+                resource.get_plan()
@@ -0,0 +1,204 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from . import exceptions
+from .models import ChangeLogEntry, ChangeLogHorizon, ChangeLogLock
+
+
+class ChangeFeed(object):
+    """
+    Records every create, update and delete of a model in the change log and
+    serves the changes made after a given sync token. Changes are recorded
+    from the model's `post_save` and `post_delete` signals, so writes made
+    through a resource and from anywhere else end up in the feed.
+
+    Adding, removing and clearing many to many relations of an object, from
+    either side, records an update of the object.
+
+    Changes made with `update()`, `bulk_create()` or raw SQL don't send
+    signals and are not recorded.
+
+    Entries are only written once the transaction that made the change has
+    committed. Each one is written while holding a lock on the model's
+    `ChangeLogLock` row, so sequence numbers are handed out in the order
+    entries become visible and a sync token can never skip an entry that
+    is still being written. A change whose worker dies between its commit
+    and the log write is lost.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.label = "{app}.{model}".format(
+            app=model._meta.app_label,
+            model=model._meta.model_name
+        )
+        uid = "restup_changes_{label}".format(label=self.label)
+        post_save.connect(
+            self.handle_save, sender=model, weak=False, dispatch_uid=uid
+        )
+        post_delete.connect(
+            self.handle_delete, sender=model, weak=False, dispatch_uid=uid
+        )
+        # Maps the through model of every many to many relation, forward or
+        # reverse, to the lookup from this model to the other side.
+        self.m2m_lookups = dict()
+        for field in model._meta.get_fields():
+            if not field.many_to_many:
+                continue
+            if field.auto_created:
+                through = field.through
+                lookup = field.field.related_query_name()
+            else:
+                through = field.remote_field.through
+                lookup = field.name
+            self.m2m_lookups[through] = lookup
+            m2m_changed.connect(
+                self.handle_m2m,
+                sender=through,
+                weak=False,
+                dispatch_uid="{uid}_{through}".format(
+                    uid=uid,
+                    through=through._meta.label_lower
+                )
+            )
+
+    def record(self, pk, action, using=None):
+        """
+        Writes a change log entry once the current transaction on `using`
+        commits, or right away outside of a transaction. Nothing is written
+        if the transaction is rolled back.
+        """
+        def write():
+            with transaction.atomic(using=using):
+                ChangeLogLock.objects.using(using).select_for_update().get_or_create(
+                    model=self.label
+                )
+                ChangeLogEntry.objects.using(using).create(
+                    model=self.label,
+                    object_pk=str(pk),
+                    action=action
+                )
+        transaction.on_commit(write, using=using)
+
+    def handle_save(self, sender, instance, created, using, raw=False, **kwargs):
+        if raw:
+            return
+        action = ChangeLogEntry.CREATE if created else ChangeLogEntry.UPDATE
+        self.record(instance.pk, action, using)
+
+    def handle_delete(self, sender, instance, using, **kwargs):
+        self.record(instance.pk, ChangeLogEntry.DELETE, using)
+
+    def handle_m2m(self, sender, instance, action, model, pk_set, using, **kwargs):
+        if action not in ('post_add', 'post_remove', 'pre_clear'):
+            return
+        if isinstance(instance, self.model):
+            self.record(instance.pk, ChangeLogEntry.UPDATE, using)
+        if model is self.model:
+            if pk_set is None:
+                # Clearing doesn't say which objects lose the relation, so
+                # look them up before they do.
+                pk_set = self.model._default_manager.using(using).filter(
+                    **{self.m2m_lookups[sender]: instance}
+                ).values_list('pk', flat=True)
+            for pk in pk_set:
+                self.record(pk, ChangeLogEntry.UPDATE, using)
+
+    def current_token(self):
+        """
+        :return: A token that resumes from the most recent change.
+        :type return: str
+        """
+        seq = ChangeLogEntry.objects.filter(
+            model=self.label
+        ).aggregate(latest=Max('seq'))['latest']
+        return str(seq or 0)
+
+    def parse_token(self, token):
+        try:
+            seq = int(token)
+        except (TypeError, ValueError):
+            raise exceptions.BadRequest("Invalid sync token.")
+        horizon = ChangeLogHorizon.objects.filter(
+            model=self.label
+        ).values_list('seq', flat=True).first()
+        if horizon is not None and seq < horizon:
+            raise exceptions.Gone(
+                "Sync token has expired. Fetch the full list again."
+            )
+        return seq
+
+    def changes(self, token, limit):
+        """
+        Fetches the changes made after `token`. Several changes to the same
+        object are collapsed into the most recent one.
+
+        :param token: A sync token from a previous response.
+        :type token: str
+
+        :param limit: The maximum number of log entries to read.
+        :type limit: int
+
+        :return: A tuple of the changed pks, the deleted pks, the token to
+        resume from and whether there are more changes to fetch.
+        :type return: tuple
+        """
+        seq = self.parse_token(token)
+        entries = list(ChangeLogEntry.objects.filter(
+            model=self.label,
+            seq__gt=seq
+        ).order_by('seq').values_list('seq', 'object_pk', 'action')[:limit + 1])
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        latest = dict()
+        for entry_seq, object_pk, action in entries:
+            latest[object_pk] = action
+        changed = [
+            pk for pk, action in latest.items()
+            if action != ChangeLogEntry.DELETE
+        ]
+        deleted = [
+            pk for pk, action in latest.items()
+            if action == ChangeLogEntry.DELETE
+        ]
+        if entries:
+            seq = entries[-1][0]
+        return changed, deleted, str(seq), has_more
+
+
+def compact(max_age=datetime.timedelta(days=30)):
+    """
+    Shrinks the change log. Entries superseded by a newer entry for the same
+    object are always safe to drop. Deletion entries older than `max_age`
+    are dropped too, which expires every token from before them.
+
+    :param max_age: How long deletions are kept around.
+    :type max_age: <datetime.timedelta>
+
+    :return: The number of entries removed.
+    :type return: int
+    """
+    latest = ChangeLogEntry.objects.values(
+        'model', 'object_pk'
+    ).annotate(latest=Max('seq')).values('latest')
+    superseded = ChangeLogEntry.objects.exclude(seq__in=latest)
+    removed = superseded.count()
+    superseded.delete()
+
+    expired = ChangeLogEntry.objects.filter(
+        action=ChangeLogEntry.DELETE,
+        timestamp__lt=timezone.now() - max_age
+    )
+    horizons = expired.values('model').annotate(latest=Max('seq'))
+    for horizon in horizons:
+        ChangeLogHorizon.objects.update_or_create(
+            model=horizon['model'],
+            defaults={'seq': horizon['latest']}
+        )
+    removed += expired.count()
+    expired.delete()
+    return removed
@@ -0,0 +1,75 @@
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+
+from .resources import ModelResource
+
+
+def resource_classes(cls=ModelResource):
+    """
+    Walks every subclass of `cls` that has a model.
+
+    :return: A generator of <ModelResource> subclasses.
+    """
+    for subclass in cls.__subclasses__():
+        if subclass.model is not None:
+            yield subclass
+        for resource in resource_classes(subclass):
+            yield resource
+
+
+def is_indexed(model, model_field):
+    """
+    Checks whether the model has an index that starts with the given field,
+    which is what the database needs to walk the table in that order. A
+    foreign key constraint is not an index, so `ForeignKey(db_index=False)`
+    counts as unindexed.
+    """
+    if model_field.primary_key or model_field.unique or model_field.db_index:
+        return True
+    opts = model._meta
+    leading = [fields[0] for fields in opts.index_together if fields]
+    leading += [fields[0] for fields in opts.unique_together if fields]
+    for index in getattr(opts, 'indexes', ()):
+        if index.fields:
+            leading.append(index.fields[0].lstrip('-'))
+    return model_field.name in leading or model_field.attname in leading
+
+
+@checks.register(checks.Tags.models)
+def check_sortable_indexes(app_configs, **kwargs):
+    """
+    Warns about sortable schema fields that have no index to order by, as
+    ordering by them has to sort the whole table for every page.
+    """
+    errors = []
+    for resource in resource_classes():
+        model = resource.model
+        if app_configs is not None and \
+                model._meta.app_config not in app_configs:
+            continue
+        for key, field in resource.schema.items():
+            if not field.get('sortable', False):
+                continue
+            try:
+                model_field = model._meta.get_field(field['attribute'])
+            except FieldDoesNotExist:
+                errors.append(checks.Error(
+                    "Sortable field '{key}' is not a model field.".format(
+                        key=key
+                    ),
+                    obj=resource,
+                    id='restup.E001'
+                ))
+                continue
+            if not is_indexed(model, model_field):
+                errors.append(checks.Warning(
+                    "Sortable field '{key}' has no index on '{field}'.".format(
+                        key=key,
+                        field=model_field.name
+                    ),
+                    hint="Add db_index=True to the field or an index that "
+                         "starts with it.",
+                    obj=resource,
+                    id='restup.W001'
+                ))
+    return errors
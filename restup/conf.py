@@ -0,0 +1,28 @@
+from django.conf import settings
+
+
+DEFAULTS = {
+    'RESTUP_AUTODISCOVER': True,
+    'RESTUP_PRECOMPILE': True,
+    'RESTUP_WARMUP': False,
+    'RESTUP_PROFILE_DIR': None,
+    'RESTUP_PROFILE_TOKEN': None,
+    'RESTUP_PROFILE_SAMPLE_RATE': 0.0,
+    'RESTUP_PROFILER': 'sample',
+    'RESTUP_PROFILE_INTERVAL': 0.005,
+    'RESTUP_PROFILE_MAX_FILES': 300,
+    'RESTUP_PROFILE_MAX_BYTES': 1024 * 1024,
+}
+
+
+def get_setting(name):
+    """
+    Fetches a RestUp setting from the Django settings module, falling back
+    to the library default if the project doesn't declare it.
+
+    :param name: The name of the setting. Should start with `RESTUP_`.
+    :type name: str
+
+    :return: The value of the setting.
+    """
+    return getattr(settings, name, DEFAULTS[name])
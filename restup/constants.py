@@ -4,11 +4,15 @@ CREATED = 201
 ACCEPTED = 202
 NO_CONTENT = 204
 
+NOT_MODIFIED = 304
+
 BAD_REQUEST = 400
 UNAUTHORIZED = 401
 FORBIDDEN = 403
 NOT_FOUND = 404
 METHOD_NOT_ALLOWED = 405
+CONFLICT = 409
+GONE = 410
 
 ERROR = 500
 NOT_IMPLEMENTED = 501
@@ -14,6 +14,7 @@ class HttpError(RestUpError):
     def __init__(self, msg=None):
         if not msg:
             msg = self.__class__.msg
+        self.msg = msg
         super(HttpError, self).__init__(msg)
 
 
@@ -22,6 +23,14 @@ class BadRequest(HttpError):
     msg = "Bad Request"
 
 
+class ValidationFailed(BadRequest):
+    msg = "Invalid Data"
+
+    def __init__(self, errors, msg=None):
+        self.errors = errors
+        super(ValidationFailed, self).__init__(msg)
+
+
 class Unauthorized(HttpError):
     status = constants.UNAUTHORIZED
     msg = "Unauthorized"
@@ -42,6 +51,16 @@ class NotAllowed(HttpError):
     msg = "Method Not Allowed"
 
 
+class Conflict(HttpError):
+    status = constants.CONFLICT
+    msg = "Conflict"
+
+
+class Gone(HttpError):
+    status = constants.GONE
+    msg = "Gone"
+
+
 class NotImplemented(HttpError):
     status = constants.NOT_IMPLEMENTED
     msg = "Method not Implemented"
@@ -0,0 +1,171 @@
+import datetime
+import hashlib
+
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+
+class IdempotencyStore(object):
+    """
+    Base class for stores that keep the responses of requests sent with an
+    `Idempotency-Key` header. A record is a dict with a `fingerprint` of the
+    request and the `status` and `body` of its response. Both are None while
+    the first request is still being handled.
+
+    :param ttl: How long responses are kept for, in seconds.
+    :type ttl: int
+
+    :param lock_timeout: How long a request may hold a key before another
+    request can take it over, in seconds. Protects against workers that die
+    halfway through a request.
+    :type lock_timeout: int
+    """
+
+    def __init__(self, ttl=86400, lock_timeout=60):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    def get(self, key):
+        """
+        :return: The record stored under `key` or None.
+        :type return: dict
+        """
+        raise NotImplementedError()
+
+    def begin(self, key, fingerprint):
+        """
+        Claims `key` for the current request. Only one request can hold a
+        key at a time.
+
+        :return: True if the key was claimed, false if another request has
+        already claimed it.
+        :type return: bool
+        """
+        raise NotImplementedError()
+
+    def finish(self, key, fingerprint, status, body):
+        """
+        Stores the response of the request holding `key`.
+        """
+        raise NotImplementedError()
+
+    def abort(self, key):
+        """
+        Releases `key` without storing a response, so that a retry runs the
+        request again.
+        """
+        raise NotImplementedError()
+
+
+class CacheIdempotencyStore(IdempotencyStore):
+    """
+    Keeps responses in a Django cache. The cache has to be shared between
+    workers for duplicates to be caught, so don't use the local memory
+    cache in production.
+    """
+
+    def __init__(self, alias='default', prefix='restup_idempotency', **kwargs):
+        super(CacheIdempotencyStore, self).__init__(**kwargs)
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return "{prefix}:{key}".format(prefix=self.prefix, key=key)
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def begin(self, key, fingerprint):
+        return self.cache.add(
+            self.make_key(key),
+            {'fingerprint': fingerprint, 'status': None, 'body': None},
+            self.lock_timeout
+        )
+
+    def finish(self, key, fingerprint, status, body):
+        self.cache.set(
+            self.make_key(key),
+            {'fingerprint': fingerprint, 'status': status, 'body': body},
+            self.ttl
+        )
+
+    def abort(self, key):
+        self.cache.delete(self.make_key(key))
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """
+    Keeps responses in the `IdempotencyRecord` table. Requires `restup` in
+    `INSTALLED_APPS`. Expired records are replaced as their keys are reused;
+    call `purge()` periodically to remove the rest.
+    """
+
+    @property
+    def record_model(self):
+        from .models import IdempotencyRecord
+        return IdempotencyRecord
+
+    def get(self, key):
+        record = self.record_model.objects.filter(
+            key=key,
+            expires__gt=timezone.now()
+        ).values('fingerprint', 'status', 'body').first()
+        return record
+
+    def begin(self, key, fingerprint):
+        model = self.record_model
+        now = timezone.now()
+        model.objects.filter(key=key, expires__lte=now).delete()
+        try:
+            with transaction.atomic():
+                model.objects.create(
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires=now + datetime.timedelta(seconds=self.lock_timeout)
+                )
+        except IntegrityError:
+            return False
+        return True
+
+    def finish(self, key, fingerprint, status, body):
+        self.record_model.objects.filter(key=key).update(
+            status=status,
+            body=body,
+            expires=timezone.now() + datetime.timedelta(seconds=self.ttl)
+        )
+
+    def abort(self, key):
+        self.record_model.objects.filter(key=key).delete()
+
+    def purge(self):
+        """
+        Removes every expired record.
+
+        :return: The number of records removed.
+        :type return: int
+        """
+        expired = self.record_model.objects.filter(expires__lte=timezone.now())
+        count = expired.count()
+        expired.delete()
+        return count
+
+
+def fingerprint(method, path, body):
+    """
+    Hashes the parts of a request that have to match for a stored response
+    to be replayed.
+
+    :return: A hex digest.
+    :type return: str
+    """
+    digest = hashlib.sha256()
+    for part in (method, path):
+        digest.update(part.encode('utf8'))
+        digest.update(b'\n')
+    digest.update(body or b'')
+    return digest.hexdigest()
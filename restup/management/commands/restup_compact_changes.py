@@ -0,0 +1,24 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from ...changes import compact
+
+
+class Command(BaseCommand):
+
+    help = "Removes superseded change log entries and deletions older than " \
+           "the given number of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help="How many days to keep deletions for. Sync tokens older "
+                 "than this will expire."
+        )
+
+    def handle(self, *args, **options):
+        removed = compact(datetime.timedelta(days=options['days']))
+        self.stdout.write("Removed {n} change log entries.".format(n=removed))
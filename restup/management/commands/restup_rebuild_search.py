@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from ...checks import resource_classes
+
+
+class Command(BaseCommand):
+
+    help = "Builds or rebuilds the search indexes kept outside of the model " \
+           "tables, e.g. the SQLite FTS tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=None,
+            help="The database to rebuild the indexes in. Defaults to the "
+                 "database each model is written to."
+        )
+
+    def handle(self, *args, **options):
+        for resource in resource_classes():
+            backend = resource.get_plan().search
+            if backend is None or not backend.uses_signals:
+                continue
+            backend.rebuild(options['database'])
+            self.stdout.write("Rebuilt the search index of {name}.".format(
+                name=resource.__name__
+            ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...api import registry
+
+
+class Command(BaseCommand):
+
+    help = "Precompiles every registered RestUp resource and reports the " \
+           "time spent on each one."
+
+    def handle(self, *args, **options):
+        for api in registry:
+            timings = api.warmup()
+            for name, elapsed in timings.items():
+                self.stdout.write("{api}.{name}: {ms:.2f}ms".format(
+                    api=api.name,
+                    name=name,
+                    ms=elapsed * 1000
+                ))
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('seq', models.AutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=100)),
+                ('object_pk', models.CharField(max_length=64)),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChangeLogHorizon',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, unique=True)),
+                ('seq', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='changelogentry',
+            index_together=set([('model', 'seq')]),
+        ),
+    ]
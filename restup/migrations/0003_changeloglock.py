@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restup', '0002_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogLock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,103 @@
+from django.db import models
+
+
+class ChangeLogEntry(models.Model):
+    """
+    A single create, update or delete of an object of a resource with a
+    change feed. The auto incrementing primary key doubles as the sequence
+    number clients resume from.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    ACTIONS = (
+        (CREATE, 'Create'),
+        (UPDATE, 'Update'),
+        (DELETE, 'Delete'),
+    )
+
+    seq = models.AutoField(
+        primary_key=True
+    )
+
+    model = models.CharField(
+        max_length=100
+    )
+
+    object_pk = models.CharField(
+        max_length=64
+    )
+
+    action = models.CharField(
+        max_length=6,
+        choices=ACTIONS
+    )
+
+    timestamp = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True
+    )
+
+    class Meta:
+        index_together = (
+            ('model', 'seq'),
+        )
+
+
+class IdempotencyRecord(models.Model):
+    """
+    The stored response of a request sent with an `Idempotency-Key` header.
+    `status` and `body` are empty while the request is still being handled.
+    """
+
+    key = models.CharField(
+        max_length=64,
+        unique=True
+    )
+
+    fingerprint = models.CharField(
+        max_length=64
+    )
+
+    status = models.PositiveSmallIntegerField(
+        null=True
+    )
+
+    body = models.TextField(
+        null=True
+    )
+
+    expires = models.DateTimeField(
+        db_index=True
+    )
+
+
+class ChangeLogHorizon(models.Model):
+    """
+    The highest sequence number pruned from a model's change log. Tokens at
+    or below it can no longer be resumed from.
+    """
+
+    model = models.CharField(
+        max_length=100,
+        unique=True
+    )
+
+    seq = models.IntegerField(
+        default=0
+    )
+
+
+class ChangeLogLock(models.Model):
+    """
+    One row per model with a change feed. Entries for a model are written
+    while holding a lock on its row, so their sequence numbers are handed
+    out in the order they become visible.
+    """
+
+    model = models.CharField(
+        max_length=100,
+        unique=True
+    )
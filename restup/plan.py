@@ -0,0 +1,308 @@
+import hashlib
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignKey
+from django.utils.encoding import force_bytes, force_text
+
+from .search import default_backend_class
+from .validation import ValidationPipeline
+
+
+FIELD_TYPES = {
+    'AutoField': 'integer',
+    'BigAutoField': 'integer',
+    'IntegerField': 'integer',
+    'BigIntegerField': 'integer',
+    'SmallIntegerField': 'integer',
+    'PositiveIntegerField': 'integer',
+    'PositiveSmallIntegerField': 'integer',
+    'FloatField': 'float',
+    'DecimalField': 'decimal',
+    'BooleanField': 'boolean',
+    'NullBooleanField': 'boolean',
+    'DateTimeField': 'datetime',
+    'DateField': 'date',
+    'TimeField': 'time',
+    'UUIDField': 'uuid',
+    'ForeignKey': 'related',
+    'OneToOneField': 'related',
+}
+
+
+class ResourcePlan(object):
+    """
+    A precompiled view of a resource's schema. Everything in here is derived
+    from class level configuration only, so it is built once per resource
+    class and shared by every request the resource handles.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.model = resource.model
+        self.fields = tuple(resource.schema.items())
+        self.readable = self.build_representation(resource.detail_fields)
+        self.list_readable = self.build_representation(resource.list_fields)
+        self.list_deferred, self.list_prefetch = self.build_list_loading()
+        self.pipeline = ValidationPipeline(self.fields, self.model)
+        self.filters = self.build_filter_table()
+        self.search = self.build_search_backend()
+        self.sortable = dict(
+            (key, field['attribute']) for key, field in self.fields
+            if field.get('sortable', False)
+        )
+        self.changes = self.build_change_feed()
+        self.aggregatable = dict(
+            (key, field['attribute']) for key, field in self.fields
+            if field.get('aggregatable', False)
+        )
+        self.aggregatable_related = self.build_related_viewnames(
+            self.aggregatable
+        )
+        self.aggregatable_types = dict(
+            (key, self.get_field_type(self.get_model_field(attribute)))
+            for key, attribute in self.aggregatable.items()
+        )
+        self.viewnames = dict(
+            (endpoint, resource.build_viewname(endpoint))
+            for endpoint in ('list', 'detail', 'aggregate')
+        )
+        self.is_user_model = self.model == get_user_model()
+        self.schema_payloads = dict(
+            (endpoint, self.build_schema_payload(endpoint))
+            for endpoint in ('list', 'detail')
+        )
+
+    def build_filter_table(self):
+        """
+        Maps every allowed query string key to the model lookup it should be
+        applied as. A filter of `exact` is also reachable through the bare
+        field name.
+
+        :return: A dict of query string keys to model lookups.
+        :type return: dict
+        """
+        table = dict()
+        for key, field in self.fields:
+            for filter_type in field.get('filters', ()):
+                model_filter = "{field}__{type}".format(
+                    field=field['attribute'],
+                    type=filter_type
+                )
+                table["{key}__{type}".format(
+                    key=key,
+                    type=filter_type
+                )] = model_filter
+                if filter_type == 'exact':
+                    table[key] = model_filter
+        return table
+
+    def build_search_backend(self):
+        """
+        Creates the search backend for the fields declared searchable with a
+        `search` key. The value of the key is either `True` or a weight from
+        `'A'` (most important) to `'D'`.
+
+        :return: A search backend instance or None if nothing is searchable.
+        """
+        search_fields = tuple(
+            (field['attribute'], None if field['search'] is True else field['search'])
+            for key, field in self.fields
+            if field.get('search')
+        )
+        if not search_fields:
+            return None
+        backend_class = self.resource.search_backend_class
+        if backend_class is None:
+            backend_class = default_backend_class(self.model)
+        return backend_class(self.model, search_fields)
+
+    def build_change_feed(self):
+        """
+        Creates the change feed of the resource if it has `change_feed`
+        enabled. The change log models are only imported then, so resources
+        without a change feed don't need `restup` in `INSTALLED_APPS`.
+
+        :return: A change feed instance or None.
+        """
+        if not self.resource.change_feed:
+            return None
+        from .changes import ChangeFeed
+        return ChangeFeed(self.model)
+
+    def get_model_field(self, attribute):
+        try:
+            return self.model._meta.get_field(attribute)
+        except FieldDoesNotExist:
+            return None
+
+    def get_field_type(self, model_field):
+        """
+        :return: The type a model field is described as in the schema, e.g.
+        `'integer'`. `'unknown'` if `model_field` is None.
+        :type return: str
+        """
+        if model_field is None:
+            return 'unknown'
+        if model_field.many_to_many or model_field.one_to_many:
+            return 'related_list'
+        return FIELD_TYPES.get(model_field.get_internal_type(), 'string')
+
+    def get_related_viewname(self, model_field):
+        """
+        :return: The detail view name of the model a foreign key points at,
+        or None if `model_field` is not a foreign key to a primary key. The
+        column of a foreign key with a `to_field` holds that field instead, so
+        it can't be used to build a `resource_uri`.
+        :type return: str
+        """
+        if not isinstance(model_field, ForeignKey):
+            return None
+        related_model = model_field.related_model
+        if model_field.foreign_related_fields[0] != related_model._meta.pk:
+            return None
+        return "api_{n}_detail".format(n=related_model._meta.model_name)
+
+    def build_representation(self, keys):
+        """
+        Builds the list of readable fields that make up one representation of
+        the resource. Foreign keys to a primary key are paired with the column
+        holding the related pk and the related detail view name, so their
+        `resource_uri` can be built without loading the related object.
+
+        :param keys: The schema keys to include, or None for all of them.
+        :type keys: tuple
+
+        :return: A tuple of (key, attribute, related) triples. `related` is
+        an (attname, viewname) pair for foreign keys to a primary key and None
+        otherwise.
+        :type return: tuple
+        """
+        readable = []
+        for key, field in self.fields:
+            if not field.get('readable', True):
+                continue
+            if keys is not None and key not in keys:
+                continue
+            attribute = field['attribute']
+            model_field = self.get_model_field(attribute)
+            related = None
+            viewname = self.get_related_viewname(model_field)
+            if viewname is not None:
+                related = (model_field.attname, viewname)
+            readable.append((key, attribute, related))
+        return tuple(readable)
+
+    def build_list_loading(self):
+        """
+        Works out which columns the list representation never reads and
+        which relations it reads for every object. Columns are only deferred
+        if the resource declares `list_fields` and every listed attribute is
+        a model field, as properties and methods may read any column.
+
+        :return: A tuple of the field names to defer and the relations to
+        prefetch when loading the list.
+        :type return: tuple
+        """
+        prefetch = []
+        used = set()
+        deferrable = self.resource.defer_list_fields \
+            and self.resource.list_fields is not None
+        for key, attribute, related in self.list_readable:
+            model_field = self.get_model_field(attribute)
+            if model_field is None:
+                deferrable = False
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch.append(attribute)
+            used.add(model_field.name)
+        deferred = []
+        if deferrable:
+            opts = self.model._meta
+            deferred = [
+                model_field.name for model_field in opts.concrete_fields
+                if model_field.name not in used and not model_field.primary_key
+            ]
+        return tuple(deferred), tuple(prefetch)
+
+    def describe_field(self, key, field, readable_keys):
+        """
+        Describes a single schema field for the schema endpoints.
+
+        :return: A dict of field metadata.
+        :type return: dict
+        """
+        model_field = self.get_model_field(field['attribute'])
+        description = OrderedDict()
+        description['type'] = self.get_field_type(model_field)
+        if model_field is not None and model_field.is_relation:
+            description['related'] = model_field.related_model._meta.model_name
+        description['readable'] = key in readable_keys
+        description['writeable'] = field.get('writeable', True)
+        description['nullable'] = getattr(model_field, 'null', True)
+        description['filters'] = list(field.get('filters', ()))
+        description['sortable'] = field.get('sortable', False)
+        description['searchable'] = bool(field.get('search'))
+        description['aggregatable'] = field.get('aggregatable', False)
+        help_text = getattr(model_field, 'help_text', '')
+        if help_text:
+            description['help_text'] = force_text(help_text)
+        return description
+
+    def build_schema_payload(self, endpoint):
+        """
+        Builds and serializes the schema description of the list or detail
+        endpoint. This only depends on class level configuration, so it is
+        done once and served as is with an ETag from then on.
+
+        :param endpoint: Either `'list'` or `'detail'`.
+        :type endpoint: str
+
+        :return: A tuple of the serialized payload and its ETag.
+        :type return: tuple
+        """
+        resource = self.resource
+        if endpoint == 'list':
+            readable = self.list_readable
+        else:
+            readable = self.readable
+        readable_keys = set(key for key, attribute, related in readable)
+        allowed = set(method.upper() for method in resource.allowed_methods)
+        payload = OrderedDict()
+        payload['resource'] = self.model._meta.model_name
+        payload['allowed_methods'] = sorted(
+            method for method in resource.ACTIONS[endpoint]
+            if method in allowed
+        )
+        payload['fields'] = OrderedDict(
+            (key, self.describe_field(key, field, readable_keys))
+            for key, field in self.fields
+        )
+        if endpoint == 'list':
+            payload['search_param'] = resource.search_param \
+                if self.search is not None else None
+            payload['order_param'] = resource.order_param \
+                if self.sortable else None
+            payload['per_page'] = resource.per_page
+        body = resource.serializer.serialize(payload)
+        etag = '"{hash}"'.format(hash=hashlib.md5(force_bytes(body)).hexdigest())
+        return body, etag
+
+    def build_related_viewnames(self, attributes):
+        """
+        Finds the foreign keys to a primary key among the given attributes so
+        that their raw values can be turned into a `resource_uri`.
+
+        :param attributes: A dict of schema keys to model attributes.
+        :type attributes: dict
+
+        :return: A dict of schema keys to related detail view names.
+        :type return: dict
+        """
+        related = dict()
+        for key, attribute in attributes.items():
+            viewname = self.get_related_viewname(self.get_model_field(attribute))
+            if viewname is not None:
+                related[key] = viewname
+        return related
@@ -0,0 +1,264 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.crypto import constant_time_compare
+
+from .conf import get_setting
+
+
+logger = logging.getLogger('restup')
+
+
+class NullPhase(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+def should_profile(request):
+    """
+    Decides whether a request gets profiled. Nothing is profiled unless
+    `RESTUP_PROFILE_DIR` is set. A request is then profiled if it carries
+    an `X-RestUp-Profile` header matching `RESTUP_PROFILE_TOKEN`, or at
+    random at `RESTUP_PROFILE_SAMPLE_RATE`.
+
+    :return: True if the request should be profiled.
+    :type return: bool
+    """
+    if not get_setting('RESTUP_PROFILE_DIR'):
+        return False
+    token = get_setting('RESTUP_PROFILE_TOKEN')
+    header = request.META.get('HTTP_X_RESTUP_PROFILE')
+    if token and header and constant_time_compare(header, token):
+        return True
+    rate = get_setting('RESTUP_PROFILE_SAMPLE_RATE')
+    return rate > 0 and random.random() < rate
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return "{module}:{func}".format(
+        module=frame.f_globals.get('__name__', '?'),
+        func=code.co_name
+    )
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of another thread at a fixed interval and counts the
+    collapsed stacks it sees. Each stack is prefixed with the phase the
+    profiler was in when it was taken.
+    """
+
+    def __init__(self, profiler, thread_id, interval):
+        super(StackSampler, self).__init__(name='restup-profiler')
+        self.daemon = True
+        self.profiler = profiler
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                names.append(frame_name(frame))
+                frame = frame.f_back
+            names.append("phase:{name}".format(name=self.profiler.current_phase))
+            names.append(self.profiler.label)
+            names.reverse()
+            self.stacks[";".join(names)] += 1
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+
+class Profiler(object):
+    """
+    Profiles a single request to a resource. Records the time spent in each
+    phase, every SQL query, and either sampled stacks or a cProfile run,
+    depending on `RESTUP_PROFILER`. The results are written to
+    `RESTUP_PROFILE_DIR`:
+
+    - `<name>.folded`: Collapsed stacks for flamegraph tools (sampler).
+    - `<name>.prof`: A pstats dump (cProfile).
+    - `<name>.json`: The phases and SQL queries.
+
+    Collapsed stacks and queries are cut off at `RESTUP_PROFILE_MAX_BYTES`.
+    """
+
+    def __init__(self, resource, handler):
+        self.label = "{resource}.{handler}".format(
+            resource=resource.__class__.__name__,
+            handler=handler
+        )
+        self.mode = get_setting('RESTUP_PROFILER')
+        self.directory = get_setting('RESTUP_PROFILE_DIR')
+        self.current_phase = 'route'
+        self.phases = []
+        self.start = None
+
+    def phase(self, name):
+        return Phase(self, name)
+
+    def run(self, func, *args, **kwargs):
+        """
+        Calls `func` under the profiler and writes out the results.
+
+        :return: Whatever `func` returns. If it's a response, the name of
+        the profile is added as the `X-RestUp-Profile` header.
+        """
+        # Imported here to keep the test utilities out of normal requests.
+        from django.test.utils import CaptureQueriesContext
+
+        # Capturing connects, so leave databases that aren't in use alone.
+        captures = [
+            CaptureQueriesContext(connection)
+            for connection in connections.all()
+            if connection.alias == DEFAULT_DB_ALIAS
+            or connection.connection is not None
+        ]
+        for capture in captures:
+            capture.__enter__()
+        sampler = None
+        profile = None
+        self.start = time.perf_counter()
+        try:
+            if self.mode == 'cprofile':
+                profile = cProfile.Profile()
+                result = profile.runcall(func, *args, **kwargs)
+            else:
+                sampler = StackSampler(
+                    self,
+                    threading.current_thread().ident,
+                    get_setting('RESTUP_PROFILE_INTERVAL')
+                )
+                sampler.start()
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    sampler.stop()
+        finally:
+            elapsed = time.perf_counter() - self.start
+            for capture in captures:
+                capture.__exit__(None, None, None)
+        try:
+            name = self.write(elapsed, captures, sampler, profile)
+        except OSError:
+            logger.exception("Could not write profile of %s", self.label)
+            return result
+        if hasattr(result, '__setitem__'):
+            result['X-RestUp-Profile'] = name
+        return result
+
+    def write(self, elapsed, captures, sampler, profile):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        name = "{time}-{pid}-{label}".format(
+            time=int(time.time() * 1000),
+            pid=os.getpid(),
+            label=self.label
+        )
+        path = os.path.join(self.directory, name)
+        max_bytes = get_setting('RESTUP_PROFILE_MAX_BYTES')
+        if sampler is not None:
+            written = 0
+            with open(path + '.folded', 'w') as f:
+                # Most common stacks first, so truncation drops the noise.
+                for stack, count in sampler.stacks.most_common():
+                    line = "{stack} {count}\n".format(stack=stack, count=count)
+                    written += len(line)
+                    if written > max_bytes:
+                        break
+                    f.write(line)
+        if profile is not None:
+            profile.dump_stats(path + '.prof')
+        queries = [
+            dict(query, database=capture.connection.alias)
+            for capture in captures
+            for query in capture.captured_queries
+        ]
+        report = {
+            'label': self.label,
+            'elapsed': elapsed,
+            'phases': self.phases,
+            'queries': [],
+            'queries_truncated': 0
+        }
+        # Dumped without indentation so the sizes add up exactly. Queries
+        # are kept in order, so the first ones survive truncation.
+        budget = max_bytes - len(json.dumps(report))
+        for query in queries:
+            size = len(json.dumps(query)) + 2
+            if size > budget:
+                break
+            budget -= size
+            report['queries'].append(query)
+        report['queries_truncated'] = len(queries) - len(report['queries'])
+        with open(path + '.json', 'w') as f:
+            json.dump(report, f)
+        rotate(self.directory, get_setting('RESTUP_PROFILE_MAX_FILES'))
+        return name
+
+
+class Phase(object):
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.previous = None
+        self.start = None
+
+    def __enter__(self):
+        self.previous = self.profiler.current_phase
+        self.profiler.current_phase = self.name
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        profiler = self.profiler
+        profiler.phases.append({
+            'name': self.name,
+            'start': self.start - profiler.start,
+            'end': time.perf_counter() - profiler.start
+        })
+        profiler.current_phase = self.previous
+        return False
+
+
+def rotate(directory, max_files):
+    """
+    Removes the oldest profiles in `directory` so that at most `max_files`
+    files are left.
+    """
+    paths = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(('.folded', '.prof', '.json'))
+    ]
+    if len(paths) <= max_files:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - max_files]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
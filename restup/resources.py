@@ -1,38 +1,54 @@
+import hashlib
+import time
+from collections import OrderedDict
+
 from django.core.paginator import Paginator, InvalidPage
 from django.conf.urls import url
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse
-from django.contrib.auth import get_user_model
-from django.db.models import Model, Manager
-from django.core.urlresolvers import reverse
+from django.core.exceptions import FieldError
+from django.db import DatabaseError, transaction
+from django.db.models import Model, Manager, Count, Sum, Avg, Min, Max
 
 from . import exceptions
+from .idempotency import fingerprint
+from .plan import ResourcePlan
+from .profiling import NULL_PHASE, Profiler, should_profile
 from .serializers import JsonSerializer
-from .constants import (OK, CREATED, NO_CONTENT, METHOD_NOT_ALLOWED,
-                        UNAUTHORIZED, NOT_FOUND, FORBIDDEN, BAD_REQUEST, ERROR)
+from .utils import etag_matches, reverse_detail_uri
+from .constants import (OK, CREATED, NO_CONTENT, NOT_MODIFIED,
+                        METHOD_NOT_ALLOWED, UNAUTHORIZED, NOT_FOUND, FORBIDDEN,
+                        ERROR)
 
 
 class ModelResource(object):
 
-    SAFE_METHODS = ("GET", )
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
-    ALL_METHODS = ("GET", "POST", "PUT", "DELETE")
+    ALL_METHODS = ("GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS")
 
     ACTIONS = {
         "list": {
             "GET": "list",
             "POST": "create",
+            "OPTIONS": "list_schema"
         },
         "detail": {
             "GET": "detail",
             "PUT": "update",
-            "DELETE": "delete"
+            "DELETE": "delete",
+            "OPTIONS": "detail_schema"
         },
         "list_schema": {
-            "GET": "list_schema"
+            "GET": "list_schema",
+            "HEAD": "list_schema"
         },
         "detail_schema": {
-            "GET": "detail_schema"
+            "GET": "detail_schema",
+            "HEAD": "detail_schema"
+        },
+        "aggregate": {
+            "GET": "aggregate"
         }
     }
 
@@ -41,22 +57,67 @@ class ModelResource(object):
         'detail': OK,
         'create': CREATED,
         'update': OK,
-        'delete': NO_CONTENT
+        'delete': NO_CONTENT,
+        'aggregate': OK,
+        'list_schema': OK,
+        'detail_schema': OK
+    }
+
+    AGGREGATES = {
+        'count': Count,
+        'sum': Sum,
+        'avg': Avg,
+        'min': Min,
+        'max': Max
+    }
+    # The schema field types each aggregate can be applied to. Fields of an
+    # unknown type are left to the database.
+    AGGREGATE_TYPES = {
+        'sum': ('integer', 'float', 'decimal'),
+        'avg': ('integer', 'float', 'decimal'),
+        'min': ('integer', 'float', 'decimal', 'date', 'datetime', 'time',
+                'string', 'related'),
+        'max': ('integer', 'float', 'decimal', 'date', 'datetime', 'time',
+                'string', 'related'),
     }
 
     model = None
     per_page = 10
     paginator_class = Paginator
+    plan_class = ResourcePlan
+    search_backend_class = None
+    search_param = 'q'
+    order_param = 'order_by'
+    list_fields = None
+    detail_fields = None
+    defer_list_fields = True
+    change_feed = False
+    change_feed_limit = 500
     serializer = JsonSerializer()
     schema = {}
     allowed_methods = ALL_METHODS
+    max_aggregate_groups = 1000
+    schema_max_age = 3600
+    idempotency_store = None
+    idempotent_actions = ('create', )
+    idempotency_wait = 5
 
     def __init__(self, *args, **kwargs):
         self.initargs = args
         self.initkwargs = kwargs
         self.request = None
         self.data = None
+        self.cleaned_data = None
+        self.validation_errors = None
+        self.allow_many = False
         self.action = None
+        self.profiler = None
+        self.plan = None
+        self.readable = ()
+        # Base resources without a model have nothing to compile.
+        if self.model is not None:
+            self.plan = self.get_plan()
+            self.readable = self.plan.readable
 
     @classmethod
     def urls(cls):
@@ -74,6 +135,21 @@ class ModelResource(object):
                 cls.as_list(),
                 name=cls.build_viewname('list')
             ),
+            url(
+                r'^schema/$',
+                cls.as_list_schema(),
+                name=cls.build_viewname('list_schema')
+            ),
+            url(
+                r'^schema/detail/$',
+                cls.as_detail_schema(),
+                name=cls.build_viewname('detail_schema')
+            ),
+            url(
+                r'^aggregate/$',
+                cls.as_aggregate(),
+                name=cls.build_viewname('aggregate')
+            ),
             url(
                 r'^(?P<pk>\w[\w/-]*)/$',
                 cls.as_detail(),
@@ -81,6 +157,51 @@ class ModelResource(object):
             )
         ]
 
+    @classmethod
+    def compile(cls):
+        """
+        Builds the precompiled schema plan for this resource class. This is
+        called for every registered resource when the app registry is ready,
+        but is also safe to call on demand.
+
+        :return: The freshly built plan.
+        :type return: <restup.plan.ResourcePlan>
+        """
+        cls._plan = cls.plan_class(cls)
+        return cls._plan
+
+    @classmethod
+    def get_plan(cls):
+        """
+        Returns the precompiled schema plan for this resource class, building
+        it the first time it is needed if it wasn't built at startup.
+
+        :return: The plan for this resource class.
+        :type return: <restup.plan.ResourcePlan>
+        """
+        plan = cls.__dict__.get('_plan')
+        if plan is None:
+            plan = cls.compile()
+        return plan
+
+    @classmethod
+    def uses_signals(cls):
+        """
+        Tells whether the plan of this resource connects model signal
+        receivers, which have to be in place before anything writes to the
+        model rather than when the resource first handles a request.
+
+        :return: True if the resource has a change feed or a search backend
+        that is kept up to date from signals.
+        :type return: bool
+        """
+        if cls.change_feed:
+            return True
+        backend_class = cls.search_backend_class
+        return backend_class is not None and backend_class.uses_signals and any(
+            field.get('search') for field in cls.schema.values()
+        )
+
     @classmethod
     def build_viewname(cls, endpoint):
         return "api_{n}_{ep}".format(
@@ -126,6 +247,63 @@ class ModelResource(object):
             **initkwargs
         ))
 
+    @classmethod
+    def as_list_schema(cls, *initargs, **initkwargs):
+        """
+        Handles all incoming requests to the list schema endpoint. Passes the
+        necessary data to the `dispatch` class method.
+
+        :param initargs: Optional positional initialization arguments.
+
+        :param initkwargs: Optional keyword initialization arguments.
+
+        :return: A call to the `dispatch` class method wrapped in the
+        `csrf_exempt` decorator.
+        """
+        return csrf_exempt(cls.dispatch(
+            'list_schema',
+            *initargs,
+            **initkwargs
+        ))
+
+    @classmethod
+    def as_detail_schema(cls, *initargs, **initkwargs):
+        """
+        Handles all incoming requests to the detail schema endpoint. Passes
+        the necessary data to the `dispatch` class method.
+
+        :param initargs: Optional positional initialization arguments.
+
+        :param initkwargs: Optional keyword initialization arguments.
+
+        :return: A call to the `dispatch` class method wrapped in the
+        `csrf_exempt` decorator.
+        """
+        return csrf_exempt(cls.dispatch(
+            'detail_schema',
+            *initargs,
+            **initkwargs
+        ))
+
+    @classmethod
+    def as_aggregate(cls, *initargs, **initkwargs):
+        """
+        Handles all incoming requests to the aggregate endpoint. Passes the
+        necessary data to the `dispatch` class method.
+
+        :param initargs: Optional positional initialization arguments.
+
+        :param initkwargs: Optional keyword initialization arguments.
+
+        :return: A call to the `dispatch` class method wrapped in the
+        `csrf_exempt` decorator.
+        """
+        return csrf_exempt(cls.dispatch(
+            'aggregate',
+            *initargs,
+            **initkwargs
+        ))
+
     @classmethod
     def dispatch(cls, action=None, *initargs, **initkwargs):
         """
@@ -149,6 +327,12 @@ class ModelResource(object):
             self = cls(*initargs, **initkwargs)
             self.request = request
             self.action = action
+            if should_profile(request):
+                # Labelled with the handler, e.g. `create` rather than the
+                # `list` endpoint it was sent to.
+                handler = cls.ACTIONS[action].get(request.method, action)
+                self.profiler = Profiler(self, handler)
+                return self.profiler.run(self.route, action, *args, **kwargs)
             return self.route(action, *args, **kwargs)
 
         return view
@@ -164,7 +348,8 @@ class ModelResource(object):
         :return: A call to an action handler.
         """
         request_method = self.request_method()
-        if not self.method_check(request_method):
+        if not self.method_check(request_method) \
+                or request_method not in self.ACTIONS[action]:
             return self.create_error_response(
                 exceptions.NotAllowed()
             )
@@ -172,11 +357,128 @@ class ModelResource(object):
             return self.create_error_response(
                 exceptions.Unauthorized()
             )
-        self.data = self.deserialize(action, self.request_body())
         view_method_name = self.ACTIONS[action][request_method]
+        idempotency_key = self.idempotency_key(view_method_name)
+        if idempotency_key is not None:
+            return self.idempotent_call(
+                idempotency_key, action, view_method_name, *args, **kwargs
+            )
+        return self.call_view(action, view_method_name, *args, **kwargs)
+
+    def call_view(self, action, view_method_name, *args, **kwargs):
+        """
+        Populates the `self.data` attribute and calls the action handler.
+
+        :param action: The action the request is trying to perform.
+
+        :param view_method_name: The name of the action handler.
+
+        :return: A call to an action handler.
+        """
+        self.data = self.deserialize(action, self.request_body())
         view = getattr(self, view_method_name)
         return view(*args, **kwargs)
 
+    def idempotency_key(self, view_method_name):
+        """
+        Builds the key the response to this request is stored under, if the
+        request carries an `Idempotency-Key` header and the resource has an
+        `idempotency_store`. Keys are scoped to the resource and the user, so
+        clients can't replay each other's responses.
+
+        :param view_method_name: The name of the action handler.
+
+        :return: A hex digest or None if the request is not idempotent.
+        :type return: str
+        """
+        if self.idempotency_store is None \
+                or view_method_name not in self.idempotent_actions:
+            return None
+        key = self.request.META.get('HTTP_IDEMPOTENCY_KEY')
+        if not key:
+            return None
+        user = getattr(self.request, 'user', None)
+        scope = "{view}:{user}:{key}".format(
+            view=self.plan.viewnames['list'],
+            user=getattr(user, 'pk', None) or '',
+            key=key
+        )
+        return hashlib.sha256(scope.encode('utf8')).hexdigest()
+
+    def idempotent_call(self, key, action, view_method_name, *args, **kwargs):
+        """
+        Calls the action handler only if no response is stored under `key`
+        yet, and stores its response. Retries get the stored response without
+        running the handler again. A retry that arrives while the first
+        request is still running waits up to `idempotency_wait` seconds for
+        its response.
+
+        :param key: The idempotency key of the request.
+
+        :param action: The action the request is trying to perform.
+
+        :param view_method_name: The name of the action handler.
+
+        :return: An Http Response object.
+        """
+        store = self.idempotency_store
+        request_fingerprint = fingerprint(
+            self.request_method(), self.request.path, self.request_body()
+        )
+        deadline = time.monotonic() + self.idempotency_wait
+        while not store.begin(key, request_fingerprint):
+            record = store.get(key)
+            if record is not None:
+                if record['fingerprint'] != request_fingerprint:
+                    return self.create_error_response(exceptions.Conflict(
+                        "Idempotency-Key was already used for another request."
+                    ))
+                if record['status'] is not None:
+                    return self.replay_response(record)
+            if time.monotonic() >= deadline:
+                return self.create_error_response(exceptions.Conflict(
+                    "A request with this Idempotency-Key is still in progress."
+                ))
+            time.sleep(0.05)
+        try:
+            response = self.call_view(action, view_method_name, *args, **kwargs)
+        except Exception:
+            store.abort(key)
+            raise
+        if response.status_code >= ERROR:
+            store.abort(key)
+        else:
+            store.finish(
+                key,
+                request_fingerprint,
+                response.status_code,
+                response.content.decode('utf8')
+            )
+        return response
+
+    def replay_response(self, record):
+        response = self.create_response(
+            status=record['status'],
+            data=record['body']
+        )
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    def phase(self, name):
+        """
+        Marks a phase of the request for the profiler, e.g.
+        `with self.phase('prepare'):`. Does nothing unless the request is
+        being profiled.
+
+        :param name: The name of the phase.
+        :type name: str
+
+        :return: A context manager.
+        """
+        if self.profiler is None:
+            return NULL_PHASE
+        return self.profiler.phase(name)
+
     def request_method(self):
         """
         Convenience method for returning the Http Request method.
@@ -194,9 +496,14 @@ class ModelResource(object):
         )
 
     def create_error_response(self, exc):
+        if not isinstance(exc, exceptions.HttpError):
+            exc = exceptions.HttpError()
         data = {
             'error': exc.msg
         }
+        errors = getattr(exc, 'errors', None)
+        if errors:
+            data['errors'] = errors
         payload = self.serializer.serialize(data)
         return HttpResponse(
             status=exc.status,
@@ -268,10 +575,7 @@ class ModelResource(object):
         viewname = "api_{n}_detail".format(
             n=obj._meta.model_name
         )
-        return reverse(
-            viewname=viewname,
-            kwargs={'pk': obj.pk}
-        )
+        return reverse_detail_uri(viewname, obj.pk)
 
     def build_filters(self):
         """
@@ -285,21 +589,12 @@ class ModelResource(object):
         :type return: dict
         """
         params = self.request.GET
+        filter_table = self.plan.filters
         filter_dict = dict()
         for key, value in params.items():
-            field = key.split('__')[0]
-            try:
-                filter_type = key.split('__')[1]
-            except IndexError:
-                filter_type = 'exact'
-            if field in self.schema:
-                field_settings = self.schema.get(field)
-                if filter_type in field_settings.get('filters', ()):
-                    model_filter = "{field}__{type}".format(
-                        field=field_settings.get('attribute'),
-                        type=filter_type
-                    )
-                    filter_dict[model_filter] = value
+            model_filter = filter_table.get(key)
+            if model_filter is not None:
+                filter_dict[model_filter] = value
         return filter_dict
 
     def apply_filters(self, queryset):
@@ -315,9 +610,181 @@ class ModelResource(object):
         filters = self.build_filters()
         return queryset.filter(**filters)
 
+    def apply_search(self, queryset):
+        """
+        Method that narrows the queryset down to the objects matching the
+        search query, if one was sent. Uses the search backend of the
+        resource, which will also order the results by relevance if it can.
+
+        :param queryset: A Django queryset.
+        :type queryset: queryset
+
+        :return: A searched queryset.
+        :type return: queryset
+        """
+        query = self.request.GET.get(self.search_param, '').strip()
+        if not query or self.plan.search is None:
+            return queryset
+        return self.plan.search.search(queryset, query)
+
+    def build_aggregation(self):
+        """
+        Method that builds the grouping and the aggregates requested through
+        the `group_by` and `metrics` query parameters. Metrics are given as a
+        comma separated list of `count` or `<function>:<field>`, e.g.
+        `count,sum:favorites`. Only fields with `'aggregatable': True` in the
+        schema can be grouped by or aggregated.
+
+        :return: A tuple of the schema keys to group by and a dict of metric
+        names to aggregate expressions.
+        :type return: tuple
+        """
+        params = self.request.GET
+        aggregatable = self.plan.aggregatable
+        group_by = []
+        for key in params.get('group_by', '').split(','):
+            if not key:
+                continue
+            if key not in aggregatable:
+                raise exceptions.BadRequest(
+                    "Can't group by '{key}'.".format(key=key)
+                )
+            group_by.append(key)
+        metrics = OrderedDict()
+        for metric in params.get('metrics', 'count').split(','):
+            if not metric:
+                continue
+            function, _, key = metric.partition(':')
+            if function not in self.AGGREGATES:
+                raise exceptions.BadRequest(
+                    "Unknown metric '{metric}'.".format(metric=metric)
+                )
+            if function == 'count' and not key:
+                metrics[metric] = Count('pk')
+                continue
+            if key not in aggregatable:
+                raise exceptions.BadRequest(
+                    "Can't aggregate '{key}'.".format(key=key)
+                )
+            field_type = self.plan.aggregatable_types[key]
+            allowed = self.AGGREGATE_TYPES.get(function)
+            if allowed is not None and field_type != 'unknown' \
+                    and field_type not in allowed:
+                raise exceptions.BadRequest(
+                    "Can't apply '{function}' to '{key}'.".format(
+                        function=function,
+                        key=key
+                    )
+                )
+            metrics[metric] = self.AGGREGATES[function](aggregatable[key])
+        if not metrics:
+            raise exceptions.BadRequest("No metrics requested.")
+        return group_by, metrics
+
+    def apply_aggregation(self, queryset, group_by, metrics):
+        """
+        Runs the aggregation as a single query. Related objects in the group
+        values are returned as their `resource_uri`. At most
+        `max_aggregate_groups` groups are returned.
+
+        :param queryset: A filtered Django queryset.
+        :type queryset: queryset
+
+        :param group_by: The schema keys to group by.
+        :type group_by: list
+
+        :param metrics: A dict of metric names to aggregate expressions.
+        :type metrics: dict
+
+        :return: A tuple of a list of dicts, one per group, and whether there
+        were more groups than returned.
+        :type return: tuple
+        """
+        aliases = OrderedDict(
+            ("restup_metric_{i}".format(i=i), metric)
+            for i, metric in enumerate(metrics)
+        )
+        annotations = dict(
+            (alias, metrics[metric]) for alias, metric in aliases.items()
+        )
+        if not group_by:
+            row = queryset.aggregate(**annotations)
+            return [dict(
+                (metric, row[alias]) for alias, metric in aliases.items()
+            )], False
+        aggregatable = self.plan.aggregatable
+        related = self.plan.aggregatable_related
+        attributes = [aggregatable[key] for key in group_by]
+        rows = list(queryset.values(*attributes).annotate(
+            **annotations
+        ).order_by(*attributes)[:self.max_aggregate_groups + 1])
+        has_more = len(rows) > self.max_aggregate_groups
+        rows = rows[:self.max_aggregate_groups]
+        results = []
+        for row in rows:
+            result = OrderedDict()
+            for key, attribute in zip(group_by, attributes):
+                value = row[attribute]
+                if key in related and value is not None:
+                    value = reverse_detail_uri(related[key], value)
+                result[key] = value
+            for alias, metric in aliases.items():
+                result[metric] = row[alias]
+            results.append(result)
+        return results, has_more
+
+    def build_ordering(self):
+        """
+        Method that builds the ordering requested through the `order_by`
+        query parameter, e.g. `?order_by=-favorites,title`. Only fields with
+        `'sortable': True` in the schema can be ordered by.
+
+        :return: A list of model attributes to order by. Could be empty.
+        :type return: list
+        """
+        sortable = self.plan.sortable
+        ordering = []
+        for key in self.request.GET.get(self.order_param, '').split(','):
+            if not key:
+                continue
+            direction = ''
+            if key.startswith('-'):
+                direction, key = '-', key[1:]
+            if key not in sortable:
+                raise exceptions.BadRequest(
+                    "Can't order by '{key}'.".format(key=key)
+                )
+            ordering.append(direction + sortable[key])
+        return ordering
+
+    def apply_ordering(self, queryset):
+        """
+        Method that orders the queryset by the requested ordering, or keeps
+        its current ordering if none was requested. The primary key is
+        always added last so that pages are stable.
+
+        :param queryset: A Django queryset.
+        :type queryset: queryset
+
+        :return: An ordered queryset.
+        :type return: queryset
+        """
+        ordering = self.build_ordering()
+        if not ordering:
+            ordering = list(queryset.query.order_by) or list(
+                self.model._meta.ordering
+            )
+        pk_names = ('pk', self.model._meta.pk.attname)
+        if not any(key.lstrip('-') in pk_names for key in ordering):
+            ordering.append('pk')
+        return queryset.order_by(*ordering)
+
     def prepare(self, obj):
         """
         Takes an object instance and turns it into a dict for serialization.
+        Only the fields of the current representation are included. That is
+        `detail_fields` unless a list handler switched `self.readable` to the
+        `list_fields` representation.
 
         :param obj: The object to be transformed into a dict.
         :type obj: object
@@ -328,18 +795,40 @@ class ModelResource(object):
         prepped_obj = {
             'resource_uri': self.build_uri(obj)
         }
-        for key, value in self.schema.items():
-            if value.get('readable', True):
-                if hasattr(obj, value['attribute']):
-                    model_value = getattr(obj, value['attribute'])
-                    if isinstance(model_value, Model):
-                        prepped_obj[key] = self.build_uri(model_value)
-                    elif isinstance(model_value, Manager):
-                        prepped_obj[key] = [self.build_uri(obj) for obj in model_value.all()]
-                    else:
-                        prepped_obj[key] = model_value
+        for key, attribute, related in self.readable:
+            if related is not None:
+                pk = getattr(obj, related[0])
+                prepped_obj[key] = None if pk is None else reverse_detail_uri(
+                    related[1], pk
+                )
+            elif hasattr(obj, attribute):
+                model_value = getattr(obj, attribute)
+                if isinstance(model_value, Model):
+                    prepped_obj[key] = self.build_uri(model_value)
+                elif isinstance(model_value, Manager):
+                    prepped_obj[key] = [self.build_uri(obj) for obj in model_value.all()]
+                else:
+                    prepped_obj[key] = model_value
         return prepped_obj
 
+    def apply_list_loading(self, queryset):
+        """
+        Method that makes the list queryset load only what the list
+        representation needs. Columns outside of `list_fields` are deferred
+        and related managers in it are prefetched.
+
+        :param queryset: A Django queryset.
+        :type queryset: queryset
+
+        :return: A queryset with deferred columns and prefetched relations.
+        :type return: queryset
+        """
+        if self.plan.list_deferred:
+            queryset = queryset.defer(*self.plan.list_deferred)
+        if self.plan.list_prefetch:
+            queryset = queryset.prefetch_related(*self.plan.list_prefetch)
+        return queryset
+
     def paginate(self, queryset):
         """
         Method used to paginate list results.
@@ -394,14 +883,47 @@ class ModelResource(object):
             'objects': object_list
         }
 
+    def clean_data(self, allow_many=False):
+        """
+        Runs `self.data` through the resource's compiled validation pipeline
+        and stores the result in `self.cleaned_data`. Values are coerced to
+        the python type of the model field they are assigned to and related
+        `resource_uri` strings are resolved to primary keys.
+
+        :param allow_many: Whether a list of objects is acceptable.
+        :type allow_many: bool
+
+        :return: A dict of model attributes to coerced values, or a list of
+        them if a list of objects was received.
+
+        :raises ValidationFailed: If any field is invalid. The exception
+        carries the errors of every invalid field.
+        """
+        pipeline = self.plan.pipeline
+        if allow_many and isinstance(self.data, list):
+            self.cleaned_data = pipeline.validate_many(self.data)
+        else:
+            self.cleaned_data = pipeline.validate(self.data)
+        return self.cleaned_data
+
     def data_is_valid(self):
-        for key, value in self.data.items():
-            if key in self.schema:
-                field = self.schema.get(key)
-                validators = field.get('validators', ())
-                for validator in validators:
-                    if not validator(value):
-                        return False
+        """
+        Validation hook called by `create` and `update` before anything is
+        written. Runs the data through `clean_data`, accepting a list of
+        objects if `self.allow_many` is set. The errors of every invalid field
+        are kept in `self.validation_errors`.
+
+        Override this to add checks of your own. Returning False rejects the
+        request with a `400 Bad Request`.
+
+        :return: True if the data is valid, False otherwise.
+        :type return: bool
+        """
+        try:
+            self.clean_data(allow_many=self.allow_many)
+        except exceptions.ValidationFailed as e:
+            self.validation_errors = e.errors
+            return False
         return True
 
     def can_create(self, request):
@@ -470,7 +992,7 @@ class ModelResource(object):
         """
         return True
 
-    def create_obj(self):
+    def create_obj(self, attributes=None):
         """
         Method used to create a new model instance.
 
@@ -482,16 +1004,18 @@ class ModelResource(object):
         so that if a password is provided, it will get hashed correctly. It also
         makes sure that the proper validation is happening when creating a new user.
 
+        :param attributes: Cleaned model attributes to create the instance
+        with. Defaults to `self.cleaned_data`.
+        :type attributes: dict
+
         :return: A brand new model instance. Fresh out of the oven.
         """
+        if attributes is None:
+            attributes = self.cleaned_data
+            if attributes is None:
+                attributes = self.clean_data()
         try:
-            attributes = dict()
-            for key, value in self.data.items():
-                if key in self.schema:
-                    field = self.schema.get(key)
-                    if field.get('writeable', True):
-                        attributes[field['attribute']] = value
-            if self.model == get_user_model():
+            if self.plan.is_user_model:
                 obj = self.model.objects.create_user(
                     **attributes
                 )
@@ -507,6 +1031,21 @@ class ModelResource(object):
         except Exception:
             raise exceptions.HttpError()
 
+    def create_obj_list(self):
+        """
+        Method used to create a model instance for every object in a bulk
+        create payload. Either all of the instances are created or none of
+        them are.
+
+        :return: A list of brand new model instances.
+        :type return: list
+        """
+        with transaction.atomic():
+            return [
+                self.create_obj(attributes)
+                for attributes in self.cleaned_data
+            ]
+
     def get_obj(self, pk):
         """
         Convenience method used to fetch a single model instance from the Db.
@@ -545,12 +1084,12 @@ class ModelResource(object):
         the new data has been committed to the Db.
         :type return: object
         """
+        attributes = self.cleaned_data
+        if attributes is None:
+            attributes = self.clean_data()
         try:
-            for key, value in self.data.items():
-                if key in self.schema:
-                    schema_field = self.schema.get(key)
-                    model_field = schema_field.get('attribute')
-                    setattr(obj, model_field, value)
+            for attribute, value in attributes.items():
+                setattr(obj, attribute, value)
             obj.save()
         except KeyError:
             raise exceptions.BadRequest()
@@ -586,7 +1125,8 @@ class ModelResource(object):
     def create(self):
         """
         This method creates a new object and returns it's Json representation
-        after creation.
+        after creation. If a list of objects is received, all of them are
+        created and a list is returned.
 
         :return: An Http Response object.
         """
@@ -594,16 +1134,28 @@ class ModelResource(object):
             return HttpResponse(
                 status=FORBIDDEN
             )
-        if not self.data_is_valid():
-            return HttpResponse(
-                status=BAD_REQUEST
+        self.allow_many = True
+        with self.phase('validate'):
+            valid = self.data_is_valid()
+        if not valid:
+            return self.create_error_response(
+                exceptions.ValidationFailed(self.validation_errors)
             )
         try:
-            obj = self.create_obj()
+            with self.phase('create'):
+                if isinstance(self.cleaned_data, list):
+                    objs = self.create_obj_list()
+                else:
+                    objs = self.create_obj()
         except Exception as e:
             return self.create_error_response(e)
-        prepped_obj = self.prepare(obj)
-        serialized_obj = self.serializer.serialize(prepped_obj)
+        with self.phase('prepare'):
+            if isinstance(objs, list):
+                prepped_obj = [self.prepare(obj) for obj in objs]
+            else:
+                prepped_obj = self.prepare(objs)
+        with self.phase('serialize'):
+            serialized_obj = self.serializer.serialize(prepped_obj)
         return self.create_response(
             status=CREATED,
             data=serialized_obj
@@ -612,13 +1164,105 @@ class ModelResource(object):
     def list(self):
         """
         This method puts together a response for GET requests to the list
-        endpoint. It also applies any specified filters and paginates the
-        list.
+        endpoint. It also applies any specified filters, search query and
+        ordering and paginates the list.
 
         :return: A Django Http Response object.
         :type return: object
         """
+        if self.plan.changes is not None:
+            if 'since' in self.request.GET:
+                return self.list_changes()
+            # Taken before the list is read, so resuming from it can only
+            # repeat changes, never miss them.
+            sync_token = self.plan.changes.current_token()
+        self.readable = self.plan.list_readable
         try:
+            obj_list = self.apply_list_loading(self.apply_ordering(
+                self.apply_search(self.apply_filters(self.get_obj_list()))
+            ))
+        except Exception as e:
+            return self.create_error_response(e)
+        if not self.can_get_list(obj_list, self.request):
+            return HttpResponse(
+                status=FORBIDDEN
+            )
+        # Building the queryset runs no SQL. The count runs in `paginate`
+        # and the page itself, with its prefetches, in `fetch`.
+        with self.phase('paginate'):
+            page = self.paginate(obj_list)
+        with self.phase('fetch'):
+            objects = list(page.object_list)
+        with self.phase('prepare'):
+            prepped_list = [self.prepare(obj) for obj in objects]
+        wrapped_data = self.wrap_list(page, prepped_list)
+        if self.plan.changes is not None:
+            wrapped_data['meta']['sync_token'] = sync_token
+        with self.phase('serialize'):
+            serialized_list = self.serializer.serialize(wrapped_data)
+        return self.create_response(
+            status=OK,
+            data=serialized_list
+        )
+
+    def list_changes(self):
+        """
+        This method puts together a response for GET requests to the list
+        endpoint with a `since` sync token. It returns only the objects
+        changed after the token was issued, the `resource_uri` of every
+        deleted object and a new token to resume from.
+
+        :return: A Django Http Response object.
+        :type return: object
+        """
+        self.readable = self.plan.list_readable
+        try:
+            with self.phase('changes'):
+                changed, deleted, sync_token, has_more = self.plan.changes.changes(
+                    self.request.GET['since'],
+                    self.change_feed_limit
+                )
+            obj_list = self.apply_list_loading(
+                self.get_obj_list().filter(pk__in=changed)
+            )
+        except Exception as e:
+            return self.create_error_response(e)
+        if not self.can_get_list(obj_list, self.request):
+            return HttpResponse(
+                status=FORBIDDEN
+            )
+        with self.phase('fetch'):
+            objects = list(obj_list)
+        with self.phase('prepare'):
+            prepped_list = [self.prepare(obj) for obj in objects]
+            viewname = self.plan.viewnames['detail']
+            deleted_uris = [reverse_detail_uri(viewname, pk) for pk in deleted]
+        with self.phase('serialize'):
+            serialized_list = self.serializer.serialize({
+                'meta': {
+                    'sync_token': sync_token,
+                    'has_more': has_more
+                },
+                'objects': prepped_list,
+                'deleted': deleted_uris
+            })
+        return self.create_response(
+            status=OK,
+            data=serialized_list
+        )
+
+    def aggregate(self):
+        """
+        This method puts together a response for GET requests to the
+        aggregate endpoint. It applies any specified filters and computes the
+        requested metrics in the database instead of handing every object to
+        the client.
+
+        :return: A Django Http Response object.
+        :type return: object
+        """
+        try:
+            group_by, metrics = self.build_aggregation()
             obj_list = self.apply_filters(
                 self.get_obj_list()
             )
@@ -628,15 +1272,85 @@ class ModelResource(object):
             return HttpResponse(
                 status=FORBIDDEN
             )
-        page = self.paginate(obj_list)
-        prepped_list = [self.prepare(obj) for obj in page.object_list]
-        wrapped_data = self.wrap_list(page, prepped_list)
-        serialized_list = self.serializer.serialize(wrapped_data)
+        try:
+            # In a savepoint, so a failed query doesn't break the transaction
+            # of the request.
+            with self.phase('aggregate'), transaction.atomic(using=obj_list.db):
+                results, has_more = self.apply_aggregation(
+                    obj_list, group_by, metrics
+                )
+        except (DatabaseError, FieldError):
+            return self.create_error_response(exceptions.BadRequest(
+                "Can't compute the requested metrics."
+            ))
+        with self.phase('serialize'):
+            serialized_list = self.serializer.serialize({
+                'meta': {
+                    'count': len(results),
+                    'has_more': has_more
+                },
+                'objects': results
+            })
         return self.create_response(
             status=OK,
             data=serialized_list
         )
 
+    def schema_response(self, endpoint):
+        """
+        Serves the precompiled schema description of an endpoint. Answers
+        conditional requests with `304 Not Modified` and `HEAD` requests
+        without a body.
+
+        :param endpoint: Either `'list'` or `'detail'`.
+        :type endpoint: str
+
+        :return: A Django Http Response object.
+        :type return: object
+        """
+        body, etag = self.plan.schema_payloads[endpoint]
+        if etag_matches(etag, self.request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponse(status=NOT_MODIFIED)
+        elif self.request_method() == 'HEAD':
+            response = self.create_response(status=OK, data=b'')
+        else:
+            response = self.create_response(status=OK, data=body)
+        response['ETag'] = etag
+        response['Cache-Control'] = "max-age={age}".format(
+            age=self.schema_max_age
+        )
+        if self.request_method() == 'OPTIONS':
+            allowed = set(method.upper() for method in self.allowed_methods)
+            response['Allow'] = ", ".join(sorted(
+                method for method in self.ACTIONS[endpoint]
+                if method in allowed
+            ))
+        return response
+
+    def list_schema(self):
+        """
+        This method describes the list endpoint: the fields of the list
+        representation and which of them can be filtered, searched and
+        ordered by. Also answers `OPTIONS` requests to the list endpoint.
+
+        :return: A Django Http Response object.
+        :type return: object
+        """
+        return self.schema_response('list')
+
+    def detail_schema(self, **kwargs):
+        """
+        This method describes the detail endpoint. Also answers `OPTIONS`
+        requests to the detail endpoint.
+
+        :param kwargs: Optional Keyword Arguments. Not used.
+        :type kwargs: dict
+
+        :return: A Django Http Response object.
+        :type return: object
+        """
+        return self.schema_response('detail')
+
     def detail(self, **kwargs):
         """
         This method is used for fetching a single object instance. It gets the
@@ -651,15 +1365,18 @@ class ModelResource(object):
         :type return: object
         """
         try:
-            obj = self.get_obj(pk=kwargs['pk'])
+            with self.phase('fetch'):
+                obj = self.get_obj(pk=kwargs['pk'])
         except Exception as e:
             return self.create_error_response(e)
         if not self.can_get(obj, self.request):
             return HttpResponse(
                 status=FORBIDDEN
             )
-        prepped_obj = self.prepare(obj)
-        serialized_obj = self.serializer.serialize(prepped_obj)
+        with self.phase('prepare'):
+            prepped_obj = self.prepare(obj)
+        with self.phase('serialize'):
+            serialized_obj = self.serializer.serialize(prepped_obj)
         return self.create_response(
             status=OK,
             data=serialized_obj
@@ -685,13 +1402,21 @@ class ModelResource(object):
             return HttpResponse(
                 status=FORBIDDEN
             )
-        if not self.data_is_valid():
-            return HttpResponse(
-                status=BAD_REQUEST
+        with self.phase('validate'):
+            valid = self.data_is_valid()
+        if not valid:
+            return self.create_error_response(
+                exceptions.ValidationFailed(self.validation_errors)
             )
-        obj = self.update_obj(obj)
-        prepped_obj = self.prepare(obj)
-        serialized_obj = self.serializer.serialize(prepped_obj)
+        try:
+            with self.phase('update'):
+                obj = self.update_obj(obj)
+        except Exception as e:
+            return self.create_error_response(e)
+        with self.phase('prepare'):
+            prepped_obj = self.prepare(obj)
+        with self.phase('serialize'):
+            serialized_obj = self.serializer.serialize(prepped_obj)
         return self.create_response(
             status=OK,
             data=serialized_obj
@@ -699,7 +1424,8 @@ class ModelResource(object):
 
     def delete(self, **kwargs):
         try:
-            obj = self.get_obj(pk=kwargs['pk'])
+            with self.phase('fetch'):
+                obj = self.get_obj(pk=kwargs['pk'])
         except Exception as e:
             return self.create_error_response(e)
         if not self.can_delete(obj, self.request):
@@ -707,7 +1433,8 @@ class ModelResource(object):
                 status=FORBIDDEN
             )
         try:
-            self.delete_obj(obj)
+            with self.phase('delete'):
+                self.delete_obj(obj)
         except Exception as e:
             return self.create_error_response(e)
         return self.create_response(
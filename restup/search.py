@@ -0,0 +1,292 @@
+import operator
+from functools import reduce
+
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+
+try:
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector)
+except ImportError:
+    SearchVector = None
+
+from . import exceptions
+
+
+class SearchBackend(object):
+    """
+    Base class for full text search backends. A backend is created once per
+    resource class with the model and the searchable model attributes
+    declared in the resource schema.
+
+    :param model: The resource's model class.
+
+    :param fields: A tuple of (attribute, weight) pairs. Weight is one of
+    `'A'`, `'B'`, `'C'` or `'D'`, `'A'` being the most important.
+    """
+
+    # Backends that keep their index up to date from model signals have to
+    # be created when Django starts, see `ModelResource.uses_signals`.
+    uses_signals = False
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+
+    def rebuild(self, using=None):
+        """
+        Rebuilds whatever index the backend keeps outside of the model table
+        from the model table. Does nothing for backends that don't keep one.
+        """
+        pass
+
+    def search(self, queryset, query):
+        """
+        Narrows the queryset down to the objects matching `query`, ordered by
+        relevance where the backend supports it.
+
+        :param queryset: A Django queryset.
+        :type queryset: queryset
+
+        :param query: The raw search string received from the client.
+        :type query: str
+
+        :return: A filtered queryset.
+        :type return: queryset
+        """
+        raise NotImplementedError()
+
+
+class NaiveSearchBackend(SearchBackend):
+    """
+    Works on any database, but can't use an index and doesn't rank. Every
+    term of the query has to appear in at least one searchable field.
+    """
+
+    def search(self, queryset, query):
+        for term in query.split():
+            queryset = queryset.filter(reduce(operator.or_, [
+                Q(**{"{attr}__icontains".format(attr=attr): term})
+                for attr, weight in self.fields
+            ]))
+        return queryset
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Uses PostgreSQL full text search with the `config` text search
+    configuration. Without an index this still scans the table, so you
+    should add a GIN index over the same expression, e.g.
+    `GinIndex(SearchVector('title', weight='A', config='english'))`, or
+    point the backend at a maintained `SearchVectorField` by setting
+    `vector_field` to its name.
+    """
+
+    config = 'english'
+    vector_field = None
+
+    def __init__(self, model, fields):
+        if SearchVector is None:
+            raise ImportError(
+                "PostgresSearchBackend requires django.contrib.postgres."
+            )
+        super(PostgresSearchBackend, self).__init__(model, fields)
+        if self.vector_field:
+            self.vector = F(self.vector_field)
+        else:
+            self.vector = reduce(operator.add, [
+                SearchVector(attr, weight=weight, config=self.config)
+                for attr, weight in self.fields
+            ])
+
+    def search(self, queryset, query):
+        search_query = SearchQuery(query, config=self.config)
+        if self.vector_field:
+            queryset = queryset.filter(**{self.vector_field: search_query})
+        else:
+            queryset = queryset.annotate(
+                search_vector=self.vector,
+            ).filter(
+                search_vector=search_query
+            )
+        return queryset.annotate(
+            search_rank=SearchRank(self.vector, search_query)
+        ).order_by('-search_rank')
+
+
+class SqliteSearchBackend(SearchBackend):
+    """
+    Uses an SQLite FTS5 shadow table that mirrors the searchable fields of
+    the model. The table is created and filled by `rebuild()`, which the
+    `restup_rebuild_search` command calls, and kept in sync through the
+    model's `post_save` and `post_delete` signals. Requires integer primary
+    keys.
+
+    Changes made with `update()` or `bulk_create()` don't send signals, so
+    call `rebuild()` after those.
+    """
+
+    uses_signals = True
+    # Column weights passed to bm25(), the same as PostgreSQL's defaults.
+    # Fields without a weight count as 'D', like they do in PostgreSQL.
+    weights = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1, None: 0.1}
+
+    def __init__(self, model, fields):
+        super(SqliteSearchBackend, self).__init__(model, fields)
+        opts = model._meta
+        self.table = "restup_fts_{label}_{name}".format(
+            label=opts.app_label,
+            name=opts.model_name
+        )
+        self.columns = [
+            opts.get_field(attr).column for attr, weight in self.fields
+        ]
+        self.ready = set()
+        uid = "restup_fts_{table}".format(table=self.table)
+        # Recompiling the resource creates a new backend. Replace the
+        # receivers of the old one, so `ready` is only kept in one place.
+        post_save.disconnect(sender=model, dispatch_uid=uid)
+        post_delete.disconnect(sender=model, dispatch_uid=uid)
+        post_save.connect(
+            self.handle_save, sender=model, weak=False, dispatch_uid=uid
+        )
+        post_delete.connect(
+            self.handle_delete, sender=model, weak=False, dispatch_uid=uid
+        )
+
+    def table_exists(self, using):
+        """
+        Checks whether the shadow table has been built in the given database.
+        Only a positive answer is remembered, so a table built later by
+        another process is picked up.
+        """
+        if using in self.ready:
+            return True
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=%s",
+                [self.table]
+            )
+            exists = cursor.fetchone() is not None
+        if exists:
+            self.ready.add(using)
+        return exists
+
+    def rebuild(self, using=None):
+        """
+        Drops and recreates the shadow table from the current contents of
+        the model table.
+        """
+        if using is None:
+            using = router.db_for_write(self.model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS {table}".format(
+                table=qn(self.table)
+            ))
+            cursor.execute("CREATE VIRTUAL TABLE {table} USING fts5({cols})".format(
+                table=qn(self.table),
+                cols=", ".join(qn(col) for col in self.columns)
+            ))
+            cursor.execute(
+                "INSERT INTO {table} (rowid, {cols}) "
+                "SELECT {pk}, {cols} FROM {source}".format(
+                    table=qn(self.table),
+                    cols=", ".join(qn(col) for col in self.columns),
+                    pk=qn(opts.pk.column),
+                    source=qn(opts.db_table)
+                )
+            )
+        self.ready.add(using)
+
+    def handle_save(self, sender, instance, using, **kwargs):
+        # Rows written before the table is built are picked up by rebuild().
+        if not self.table_exists(using):
+            return
+        qn = connections[using].ops.quote_name
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {table} WHERE rowid = %s".format(
+                    table=qn(self.table)
+                ),
+                [instance.pk]
+            )
+            cursor.execute(
+                "INSERT INTO {table} (rowid, {cols}) VALUES (%s, {params})".format(
+                    table=qn(self.table),
+                    cols=", ".join(qn(col) for col in self.columns),
+                    params=", ".join(["%s"] * len(self.columns))
+                ),
+                [instance.pk] + [
+                    getattr(instance, attr) for attr, weight in self.fields
+                ]
+            )
+
+    def handle_delete(self, sender, instance, using, **kwargs):
+        if not self.table_exists(using):
+            return
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {table} WHERE rowid = %s".format(
+                    table=connections[using].ops.quote_name(self.table)
+                ),
+                [instance.pk]
+            )
+
+    def match_expression(self, query):
+        # Quote every term so client input can't use the FTS query syntax.
+        return " ".join(
+            '"{term}"'.format(term=term.replace('"', '""'))
+            for term in query.split()
+        )
+
+    def search(self, queryset, query):
+        """
+        Joins the shadow table, so a single MATCH both narrows the results
+        down and ranks them, while filters, counting and pagination still run
+        in the database. Results are ordered by their weighted bm25 rank,
+        which is lower for better matches.
+        """
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset
+        using = queryset.db
+        if not self.table_exists(using):
+            raise exceptions.HttpError("Search index has not been built.")
+        qn = connections[using].ops.quote_name
+        opts = self.model._meta
+        table = qn(self.table)
+        rank = "bm25({table}, {weights})".format(
+            table=table,
+            weights=", ".join(
+                repr(self.weights[weight]) for attr, weight in self.fields
+            )
+        )
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                "{table} MATCH %s".format(table=table),
+                "{table}.rowid = {source}.{pk}".format(
+                    table=table,
+                    source=qn(opts.db_table),
+                    pk=qn(opts.pk.column)
+                )
+            ],
+            params=[expression],
+            select={'search_rank': rank}
+        ).order_by('search_rank')
+
+
+def default_backend_class(model):
+    """
+    Picks a search backend based on the database the model is read from.
+    PostgreSQL gets full text search, anything else the naive backend. The
+    SQLite backend creates tables and has to be opted into explicitly.
+    """
+    using = router.db_for_read(model)
+    if connections[using].vendor == 'postgresql' and SearchVector is not None:
+        return PostgresSearchBackend
+    return NaiveSearchBackend
@@ -0,0 +1,40 @@
+import json
+
+from django.test import TestCase, TransactionTestCase
+
+
+class ApiClientMixin(object):
+    """
+    Sends JSON to the test app's API and decodes the responses.
+    """
+
+    def request(self, method, path, data=None, **extra):
+        if data is not None:
+            extra['data'] = json.dumps(data)
+            extra['content_type'] = 'application/json'
+        response = getattr(self.client, method)(path, **extra)
+        content = response.content.decode('utf8')
+        response.json_data = json.loads(content) if content else None
+        return response
+
+    def get(self, path, **extra):
+        return self.request('get', path, **extra)
+
+    def post(self, path, data, **extra):
+        return self.request('post', path, data, **extra)
+
+    def put(self, path, data, **extra):
+        return self.request('put', path, data, **extra)
+
+    def delete(self, path, **extra):
+        return self.request('delete', path, **extra)
+
+
+class ApiTestCase(ApiClientMixin, TestCase):
+    pass
+
+
+class ApiTransactionTestCase(ApiClientMixin, TransactionTestCase):
+    """
+    For tests that need `on_commit` callbacks to run.
+    """
@@ -0,0 +1,21 @@
+SECRET_KEY = 'restup-tests'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'restup',
+    'restup.tests.testapp',
+]
+
+MIDDLEWARE = []
+
+ROOT_URLCONF = 'restup.tests.testapp.urls'
+
+USE_TZ = True
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from unittest import mock
+
+from .base import ApiTestCase
+from .testapp.api import BookResource
+from .testapp.models import Author, Book
+
+
+class AggregationTests(ApiTestCase):
+
+    def setUp(self):
+        self.tolkien = Author.objects.create(name='Tolkien')
+        self.pratchett = Author.objects.create(name='Pratchett')
+        Book.objects.create(title='Hobbit', price=Decimal('10'), author=self.tolkien)
+        Book.objects.create(title='Silmarillion', price=Decimal('20'), author=self.tolkien)
+        Book.objects.create(title='Mort', price=Decimal('6'), author=self.pratchett,
+                            genre='humour')
+
+    def aggregate(self, query):
+        return self.get('/api/books/aggregate/?' + query)
+
+    def test_counts_everything_by_default(self):
+        response = self.aggregate('')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json_data, {
+            'meta': {'count': 1, 'has_more': False},
+            'objects': [{'count': 3}]
+        })
+
+    def test_groups_in_one_query(self):
+        # The aggregation, and the savepoint around it.
+        with self.assertNumQueries(3):
+            response = self.aggregate('group_by=genre&metrics=count,max:price')
+        objects = response.json_data['objects']
+        self.assertEqual([obj['genre'] for obj in objects], ['fiction', 'humour'])
+        self.assertEqual([obj['count'] for obj in objects], [2, 1])
+        self.assertEqual(
+            [Decimal(str(obj['max:price'])) for obj in objects],
+            [Decimal('20'), Decimal('6')]
+        )
+
+    def test_related_groups_are_uris(self):
+        response = self.aggregate('group_by=author&metrics=sum:price')
+        objects = response.json_data['objects']
+        self.assertEqual(objects[0]['author'], '/api/authors/{pk}/'.format(pk=self.tolkien.pk))
+        self.assertEqual(Decimal(str(objects[0]['sum:price'])), Decimal('30'))
+
+    def test_filters_apply(self):
+        response = self.aggregate('title=Mort')
+        self.assertEqual(response.json_data['objects'], [{'count': 1}])
+
+    def test_has_more_when_groups_are_cut_off(self):
+        with mock.patch.object(BookResource, 'max_aggregate_groups', 1):
+            response = self.aggregate('group_by=genre')
+        self.assertEqual(len(response.json_data['objects']), 1)
+        self.assertTrue(response.json_data['meta']['has_more'])
+
+    def test_rejects_invalid_requests(self):
+        for query, message in (
+            ('group_by=title', "Can't group by 'title'."),
+            ('metrics=median:price', "Unknown metric 'median:price'."),
+            ('metrics=sum:title', "Can't aggregate 'title'."),
+            ('metrics=sum:genre', "Can't apply 'sum' to 'genre'."),
+            ('metrics=,', "No metrics requested."),
+        ):
+            response = self.aggregate(query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.json_data, {'error': message})
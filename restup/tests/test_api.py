@@ -0,0 +1,63 @@
+from django.conf.urls import include, url
+from django.test import TestCase, override_settings
+
+from restup import Api, ModelResource
+from restup.utils import reverse_detail_uri, resolve_detail_uri
+
+from .testapp.api import AuthorResource, BookResource, api
+from .testapp.models import Book
+
+
+urlpatterns = [
+    url(r'^v2/', include(api.urls)),
+]
+
+
+class ApiTests(TestCase):
+
+    def test_register_defaults_to_the_plural_model_name(self):
+        self.assertEqual(
+            list(api._registry.items())[:1],
+            [('authors', AuthorResource)]
+        )
+
+    def test_compile_records_timings(self):
+        other = Api('other')
+        other.register(BookResource, 'books')
+        timings = other.compile()
+        self.assertEqual(list(timings), ['BookResource'])
+        self.assertIsNotNone(BookResource.__dict__.get('_plan'))
+
+    def test_warmup_caches_uri_templates(self):
+        api.warmup()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                reverse_detail_uri('api_book_detail', 7),
+                '/api/books/7/'
+            )
+
+    def test_resource_without_a_model(self):
+        resource = ModelResource()
+        self.assertIsNone(resource.plan)
+
+
+class UriTests(TestCase):
+
+    def test_reverse_and_resolve(self):
+        uri = reverse_detail_uri('api_book_detail', 3)
+        self.assertEqual(uri, '/api/books/3/')
+        self.assertEqual(resolve_detail_uri(uri), ('api_book_detail', '3'))
+        self.assertIsNone(resolve_detail_uri('/nowhere/'))
+
+    def test_caches_follow_root_urlconf(self):
+        self.assertEqual(reverse_detail_uri('api_book_detail', 1), '/api/books/1/')
+        self.assertIsNotNone(resolve_detail_uri('/api/books/1/'))
+        with override_settings(ROOT_URLCONF=__name__):
+            self.assertEqual(reverse_detail_uri('api_book_detail', 1), '/v2/books/1/')
+            self.assertIsNone(resolve_detail_uri('/api/books/1/'))
+        self.assertEqual(reverse_detail_uri('api_book_detail', 1), '/api/books/1/')
+
+    def test_detail_uri_in_responses(self):
+        book = Book.objects.create(title='Hobbit')
+        response = self.client.get('/api/books/{pk}/'.format(pk=book.pk))
+        self.assertContains(response, '"resource_uri": "/api/books/{pk}/"'.format(pk=book.pk))
@@ -0,0 +1,110 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from restup.models import ChangeLogEntry
+
+from .base import ApiTransactionTestCase
+from .testapp.api import BookResource
+from .testapp.models import Book, Tag
+
+
+class ChangeFeedTests(ApiTransactionTestCase):
+
+    def sync_token(self):
+        return self.get('/api/books/').json_data['meta']['sync_token']
+
+    def changes(self, token):
+        return self.get('/api/books/?since={token}'.format(token=token))
+
+    def test_returns_changes_since_the_token(self):
+        Book.objects.create(title='Hobbit')
+        token = self.sync_token()
+        book = Book.objects.create(title='Mort')
+        response = self.changes(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [obj['title'] for obj in response.json_data['objects']],
+            ['Mort']
+        )
+        self.assertEqual(response.json_data['deleted'], [])
+        self.assertFalse(response.json_data['meta']['has_more'])
+
+        pk = book.pk
+        book.delete()
+        response = self.changes(response.json_data['meta']['sync_token'])
+        self.assertEqual(response.json_data['objects'], [])
+        self.assertEqual(
+            response.json_data['deleted'],
+            ['/api/books/{pk}/'.format(pk=pk)]
+        )
+
+    def test_repeated_changes_are_collapsed(self):
+        token = self.sync_token()
+        book = Book.objects.create(title='Hobbit')
+        book.title = 'The Hobbit'
+        book.save()
+        response = self.changes(token)
+        self.assertEqual(
+            [obj['title'] for obj in response.json_data['objects']],
+            ['The Hobbit']
+        )
+
+    def test_has_more_when_the_limit_is_reached(self):
+        token = self.sync_token()
+        Book.objects.create(title='Hobbit')
+        Book.objects.create(title='Mort')
+        with mock.patch.object(BookResource, 'change_feed_limit', 1):
+            response = self.changes(token)
+        self.assertEqual(len(response.json_data['objects']), 1)
+        self.assertTrue(response.json_data['meta']['has_more'])
+        response = self.changes(response.json_data['meta']['sync_token'])
+        self.assertEqual(len(response.json_data['objects']), 1)
+        self.assertFalse(response.json_data['meta']['has_more'])
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        token = self.sync_token()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Book.objects.create(title='Hobbit')
+            raise RuntimeError()
+        self.assertEqual(self.changes(token).json_data['objects'], [])
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_many_to_many_changes_from_either_side(self):
+        book = Book.objects.create(title='Hobbit')
+        tag = Tag.objects.create(name='classic')
+        token = self.sync_token()
+        book.tags.add(tag)
+        response = self.changes(token)
+        self.assertEqual(len(response.json_data['objects']), 1)
+
+        token = response.json_data['meta']['sync_token']
+        tag.books.clear()
+        response = self.changes(token)
+        self.assertEqual(len(response.json_data['objects']), 1)
+
+    def test_invalid_token(self):
+        response = self.changes('latest')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json_data, {'error': "Invalid sync token."})
+
+    def test_compacting_expires_old_tokens(self):
+        book = Book.objects.create(title='Hobbit')
+        book.title = 'The Hobbit'
+        book.save()
+        book.delete()
+        ChangeLogEntry.objects.update(
+            timestamp=timezone.now() - datetime.timedelta(days=31)
+        )
+        call_command('restup_compact_changes', days=30, stdout=StringIO())
+        self.assertFalse(ChangeLogEntry.objects.exists())
+        response = self.changes('0')
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json_data, {
+            'error': "Sync token has expired. Fetch the full list again."
+        })
+
@@ -0,0 +1,98 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from restup.idempotency import CacheIdempotencyStore, DatabaseIdempotencyStore
+from restup.models import IdempotencyRecord
+
+from .base import ApiTestCase
+from .testapp.api import BookResource
+from .testapp.models import Book
+
+
+class IdempotencyTestsMixin(object):
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(BookResource, 'idempotency_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create(self, data, key='abc'):
+        extra = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.post('/api/books/', data, **extra)
+
+    def test_retries_get_the_stored_response(self):
+        first = self.create({'title': 'Hobbit'})
+        retry = self.create({'title': 'Hobbit'})
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json_data, first.json_data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_reused_key_conflicts(self):
+        self.create({'title': 'Hobbit'})
+        response = self.create({'title': 'Mort'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json_data, {
+            'error': "Idempotency-Key was already used for another request."
+        })
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_requests_without_a_key_are_not_stored(self):
+        self.create({'title': 'Hobbit'}, key=None)
+        self.create({'title': 'Hobbit'}, key=None)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_client_errors_are_replayed(self):
+        first = self.create({'price': 'free'})
+        retry = self.create({'price': 'free'})
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(retry.json_data, first.json_data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+
+    def test_server_errors_release_the_key(self):
+        with mock.patch.object(BookResource, 'create_obj', side_effect=RuntimeError):
+            response = self.create({'title': 'Hobbit'})
+        self.assertEqual(response.status_code, 500)
+        response = self.create({'title': 'Hobbit'})
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_request_in_progress(self):
+        with mock.patch.object(BookResource, 'idempotency_wait', 0), \
+                mock.patch.object(self.store, 'begin', return_value=False), \
+                mock.patch.object(self.store, 'get', return_value=None):
+            response = self.create({'title': 'Hobbit'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json_data, {
+            'error': "A request with this Idempotency-Key is still in progress."
+        })
+        self.assertFalse(Book.objects.exists())
+
+
+class CacheIdempotencyStoreTests(IdempotencyTestsMixin, ApiTestCase):
+
+    store = CacheIdempotencyStore()
+
+
+class DatabaseIdempotencyStoreTests(IdempotencyTestsMixin, ApiTestCase):
+
+    store = DatabaseIdempotencyStore()
+
+    def test_expired_records(self):
+        self.create({'title': 'Hobbit'})
+        IdempotencyRecord.objects.update(
+            expires=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        response = self.create({'title': 'Mort'})
+        self.assertEqual(response.status_code, 201)
+        IdempotencyRecord.objects.update(
+            expires=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        self.assertEqual(self.store.purge(), 1)
+        self.assertFalse(IdempotencyRecord.objects.exists())
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core import checks
+
+from restup import ModelResource
+from restup.checks import check_sortable_indexes, is_indexed
+
+from .base import ApiTestCase
+from .testapp.models import Book
+
+
+class OrderingTests(ApiTestCase):
+
+    def setUp(self):
+        for title, price in (('Hobbit', 10), ('Mort', 6), ('Eric', 6)):
+            Book.objects.create(title=title, price=price)
+
+    def titles(self, query):
+        response = self.get('/api/books/?' + query)
+        return [obj['title'] for obj in response.json_data['objects']]
+
+    def test_orders_by_sortable_fields(self):
+        self.assertEqual(self.titles('order_by=title'), ['Eric', 'Hobbit', 'Mort'])
+        self.assertEqual(self.titles('order_by=-title'), ['Mort', 'Hobbit', 'Eric'])
+
+    def test_ties_are_broken_by_pk(self):
+        self.assertEqual(self.titles('order_by=price'), ['Mort', 'Eric', 'Hobbit'])
+        self.assertEqual(self.titles('order_by=-price'), ['Hobbit', 'Mort', 'Eric'])
+
+    def test_defaults_to_pk(self):
+        self.assertEqual(self.titles(''), ['Hobbit', 'Mort', 'Eric'])
+
+    def test_rejects_fields_that_are_not_sortable(self):
+        for key in ('genre', '-genre', 'nothing'):
+            response = self.get('/api/books/?order_by=' + key)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json_data, {
+                'error': "Can't order by '{key}'.".format(key=key.lstrip('-'))
+            })
+
+
+class SortableIndexCheckTests(ApiTestCase):
+
+    def test_is_indexed(self):
+        opts = Book._meta
+        self.assertTrue(is_indexed(Book, opts.pk))
+        self.assertTrue(is_indexed(Book, opts.get_field('title')))
+        self.assertTrue(is_indexed(Book, opts.get_field('author')))
+        self.assertFalse(is_indexed(Book, opts.get_field('description')))
+        # A foreign key constraint is not an index.
+        self.assertFalse(is_indexed(Book, opts.get_field('editor')))
+
+    def test_check_sortable_indexes(self):
+        class SortedBookResource(ModelResource):
+            model = Book
+            schema = {
+                'title': {'attribute': 'title', 'sortable': True},
+                'editor': {'attribute': 'editor', 'sortable': True},
+                'rating': {'attribute': 'rating', 'sortable': True},
+                'genre': {'attribute': 'genre'}
+            }
+
+        with mock.patch('restup.checks.resource_classes',
+                        return_value=[SortedBookResource]):
+            errors = check_sortable_indexes(None)
+        self.assertEqual(sorted(errors, key=lambda error: error.id), [
+            checks.Error(
+                "Sortable field 'rating' is not a model field.",
+                obj=SortedBookResource,
+                id='restup.E001'
+            ),
+            checks.Warning(
+                "Sortable field 'editor' has no index on 'editor'.",
+                hint="Add db_index=True to the field or an index that "
+                     "starts with it.",
+                obj=SortedBookResource,
+                id='restup.W001'
+            )
+        ])
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+
+from django.test import override_settings
+
+from .base import ApiTestCase
+from .testapp.models import Book
+
+
+class ProfilingTests(ApiTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(
+            RESTUP_PROFILE_DIR=self.directory,
+            RESTUP_PROFILE_TOKEN='secret',
+            RESTUP_PROFILER='cprofile'
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def profiled(self, method, path, data=None, token='secret'):
+        return self.request(method, path, data, HTTP_X_RESTUP_PROFILE=token)
+
+    def report(self, response):
+        path = os.path.join(self.directory, response['X-RestUp-Profile'] + '.json')
+        with open(path) as f:
+            return json.load(f)
+
+    def test_only_requests_with_the_token_are_profiled(self):
+        response = self.get('/api/books/')
+        self.assertFalse(response.has_header('X-RestUp-Profile'))
+        response = self.profiled('get', '/api/books/', token='guess')
+        self.assertFalse(response.has_header('X-RestUp-Profile'))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_nothing_is_profiled_without_a_directory(self):
+        with override_settings(RESTUP_PROFILE_DIR=None):
+            response = self.profiled('get', '/api/books/')
+        self.assertFalse(response.has_header('X-RestUp-Profile'))
+
+    def test_report_is_labelled_by_handler(self):
+        response = self.profiled('post', '/api/books/', {'title': 'Hobbit'})
+        self.assertEqual(response.status_code, 201)
+        name = response['X-RestUp-Profile']
+        self.assertTrue(name.endswith('-BookResource.create'))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, name + '.prof')))
+        report = self.report(response)
+        self.assertEqual(report['label'], 'BookResource.create')
+        self.assertEqual(
+            [phase['name'] for phase in report['phases']],
+            ['validate', 'create', 'prepare', 'serialize']
+        )
+        self.assertTrue(any('INSERT' in query['sql'] for query in report['queries']))
+        self.assertEqual(report['queries_truncated'], 0)
+
+    def test_phases_of_every_handler(self):
+        book = Book.objects.create(title='Hobbit')
+        detail = '/api/books/{pk}/'.format(pk=book.pk)
+        for method, path, label, phases in (
+            ('get', '/api/books/', 'list', ['paginate', 'fetch', 'prepare', 'serialize']),
+            ('get', '/api/books/?since=0', 'list',
+             ['changes', 'fetch', 'prepare', 'serialize']),
+            ('get', '/api/books/aggregate/', 'aggregate', ['aggregate', 'serialize']),
+            ('get', detail, 'detail', ['fetch', 'prepare', 'serialize']),
+            ('delete', detail, 'delete', ['fetch', 'delete']),
+        ):
+            report = self.report(self.profiled(method, path))
+            self.assertEqual(report['label'], 'BookResource.' + label)
+            self.assertEqual([phase['name'] for phase in report['phases']], phases)
+
+    def test_queries_are_cut_off(self):
+        with override_settings(RESTUP_PROFILE_MAX_BYTES=600):
+            response = self.profiled('get', '/api/books/')
+        path = os.path.join(self.directory, response['X-RestUp-Profile'] + '.json')
+        self.assertLessEqual(os.path.getsize(path), 600)
+        report = self.report(response)
+        self.assertGreater(report['queries_truncated'], 0)
+
+    def test_sampler_writes_collapsed_stacks(self):
+        with override_settings(RESTUP_PROFILER='sample'):
+            response = self.profiled('get', '/api/books/')
+        name = response['X-RestUp-Profile']
+        self.assertTrue(os.path.exists(os.path.join(self.directory, name + '.folded')))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, name + '.prof')))
+
+    def test_old_profiles_are_removed(self):
+        with override_settings(RESTUP_PROFILE_MAX_FILES=4):
+            for i in range(4):
+                self.profiled('get', '/api/books/')
+        self.assertEqual(len(os.listdir(self.directory)), 4)
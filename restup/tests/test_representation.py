@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from restup.plan import ResourcePlan
+
+from .base import ApiTestCase
+from .testapp.api import AuthorResource, BookResource
+from .testapp.models import Author, Book, Tag
+
+
+class RepresentationTests(ApiTestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name='Tolkien', code='jrrt')
+        self.book = Book.objects.create(
+            title='Hobbit',
+            price=Decimal('10'),
+            author=self.author,
+            editor=self.author
+        )
+        self.book.tags.add(Tag.objects.create(name='classic'))
+
+    def test_list_uses_list_fields(self):
+        response = self.get('/api/books/')
+        self.assertEqual(
+            set(response.json_data['objects'][0]),
+            {'title', 'price', 'author', 'resource_uri'}
+        )
+
+    def test_detail_uses_every_field(self):
+        response = self.get('/api/books/{pk}/'.format(pk=self.book.pk))
+        self.assertEqual(set(response.json_data), set(BookResource.schema) | {'resource_uri'})
+        self.assertEqual(
+            response.json_data['tags'],
+            ['/api/tags/{pk}/'.format(pk=self.book.tags.get().pk)]
+        )
+
+    def test_create_returns_the_detail_representation(self):
+        response = self.post('/api/books/', {'title': 'Mort'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('description', response.json_data)
+
+    def test_related_uris_use_the_primary_key(self):
+        response = self.get('/api/books/{pk}/'.format(pk=self.book.pk))
+        uri = '/api/authors/{pk}/'.format(pk=self.author.pk)
+        self.assertEqual(response.json_data['author'], uri)
+        # `editor` points at `Author.code`, so its column isn't the pk.
+        self.assertEqual(response.json_data['editor'], uri)
+
+    def test_list_loads_only_list_columns(self):
+        Book.objects.create(title='Silmarillion', author=self.author)
+        # The sync token, the count and the page, without fetching the
+        # authors.
+        with self.assertNumQueries(3):
+            response = self.get('/api/books/')
+        self.assertEqual(len(response.json_data['objects']), 2)
+        plan = BookResource.get_plan()
+        self.assertIn('description', plan.list_deferred)
+        self.assertNotIn('title', plan.list_deferred)
+
+    def test_reverse_relations_are_prefetched(self):
+        Book.objects.create(title='Silmarillion', author=self.author)
+        # The count, the page and the books of every author on it.
+        with self.assertNumQueries(3):
+            response = self.get('/api/authors/')
+        self.assertEqual(len(response.json_data['objects'][0]['books']), 2)
+
+    def test_nothing_is_deferred_without_list_fields(self):
+        plan = ResourcePlan(AuthorResource)
+        self.assertEqual(plan.list_deferred, ())
+        self.assertEqual(plan.list_prefetch, ('books',))
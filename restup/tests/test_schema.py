@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+
+from restup.utils import etag_matches
+
+from .base import ApiTestCase
+
+
+class SchemaTests(ApiTestCase):
+
+    def test_list_schema(self):
+        response = self.get('/api/books/schema/')
+        self.assertEqual(response.status_code, 200)
+        schema = response.json_data
+        self.assertEqual(schema['resource'], 'book')
+        self.assertEqual(schema['allowed_methods'], ['GET', 'OPTIONS', 'POST'])
+        self.assertEqual(schema['search_param'], 'q')
+        self.assertEqual(schema['order_param'], 'order_by')
+        self.assertEqual(schema['fields']['title']['filters'], ['exact', 'icontains'])
+        self.assertTrue(schema['fields']['title']['readable'])
+        self.assertFalse(schema['fields']['description']['readable'])
+        self.assertEqual(schema['fields']['author']['type'], 'related')
+        self.assertEqual(schema['fields']['author']['related'], 'author')
+
+    def test_detail_schema(self):
+        schema = self.get('/api/books/schema/detail/').json_data
+        self.assertEqual(schema['allowed_methods'], ['DELETE', 'GET', 'OPTIONS', 'PUT'])
+        self.assertTrue(schema['fields']['description']['readable'])
+        self.assertNotIn('search_param', schema)
+
+    def test_cached_with_an_etag(self):
+        response = self.get('/api/books/schema/')
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'max-age=3600')
+        for header in (etag, 'W/' + etag, '"other", ' + etag, '*'):
+            response = self.get('/api/books/schema/', HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response['ETag'], etag)
+        response = self.get('/api/books/schema/', HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_and_detail_etags_differ(self):
+        list_etag = self.get('/api/books/schema/')['ETag']
+        detail_etag = self.get('/api/books/schema/detail/')['ETag']
+        self.assertNotEqual(list_etag, detail_etag)
+
+    def test_head(self):
+        response = self.request('head', '/api/books/schema/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.get('/api/books/schema/')['ETag'])
+
+    def test_options(self):
+        response = self.request('options', '/api/books/')
+        self.assertEqual(response['Allow'], 'GET, OPTIONS, POST')
+        self.assertEqual(response.json_data, self.get('/api/books/schema/').json_data)
+        response = self.request('options', '/api/books/1/')
+        self.assertEqual(response['Allow'], 'DELETE, GET, OPTIONS, PUT')
+
+
+class EtagMatchTests(SimpleTestCase):
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"abc"', '"abc"'))
+        self.assertTrue(etag_matches('"abc"', 'W/"abc"'))
+        self.assertTrue(etag_matches('"abc"', '"x", "abc"'))
+        self.assertTrue(etag_matches('"abc"', ' * '))
+        self.assertFalse(etag_matches('"abc"', '"abcd"'))
+        self.assertFalse(etag_matches('"abc"', '"x,abc"'))
+        self.assertFalse(etag_matches('"abc"', ''))
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from restup.search import NaiveSearchBackend
+
+from .base import ApiTestCase
+from .testapp.api import BookResource
+from .testapp.models import Book
+
+
+class SqliteSearchTests(ApiTestCase):
+
+    def setUp(self):
+        self.backend = BookResource.get_plan().search
+        Book.objects.create(title='Dragons', description='A book about wyrms.')
+        Book.objects.create(title='Wyrms', description='Not about dragons.')
+        Book.objects.create(title='Gardens', description='Roses and tulips.')
+
+    def tearDown(self):
+        # The table goes away with the test transaction.
+        self.backend.ready.clear()
+
+    def rebuild(self):
+        call_command('restup_rebuild_search', stdout=StringIO())
+
+    def titles(self, response):
+        return [obj['title'] for obj in response.json_data['objects']]
+
+    def test_unbuilt_index_is_an_error(self):
+        response = self.get('/api/books/?q=dragons')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json_data, {'error': "Search index has not been built."})
+
+    def test_title_outranks_description(self):
+        self.rebuild()
+        response = self.get('/api/books/?q=dragons')
+        self.assertEqual(self.titles(response), ['Dragons', 'Wyrms'])
+        self.assertEqual(response.json_data['meta']['count'], 2)
+        response = self.get('/api/books/?q=wyrms')
+        self.assertEqual(self.titles(response), ['Wyrms', 'Dragons'])
+
+    def test_search_combines_with_filters(self):
+        self.rebuild()
+        response = self.get('/api/books/?q=dragons&title=Wyrms')
+        self.assertEqual(self.titles(response), ['Wyrms'])
+        self.assertEqual(response.json_data['meta']['count'], 1)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.rebuild()
+        Book.objects.create(title='More dragons')
+        Book.objects.get(title='Wyrms').delete()
+        response = self.get('/api/books/?q=dragons')
+        self.assertEqual(
+            set(self.titles(response)), {'Dragons', 'More dragons'}
+        )
+
+    def test_query_syntax_is_quoted(self):
+        self.rebuild()
+        response = self.get('/api/books/?q=title:gardens OR "roses')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(response), [])
+
+
+class NaiveSearchTests(ApiTestCase):
+
+    def test_every_term_must_match_a_field(self):
+        Book.objects.create(title='Dragons', description='Red and green.')
+        Book.objects.create(title='Green gardens')
+        backend = NaiveSearchBackend(Book, (('title', 'A'), ('description', 'D')))
+        found = backend.search(Book.objects.all(), 'green dragons')
+        self.assertEqual([book.title for book in found], ['Dragons'])
+        found = backend.search(Book.objects.order_by('pk'), 'green')
+        self.assertEqual(len(found), 2)
@@ -0,0 +1,130 @@
+import re
+
+from django.test import RequestFactory
+
+from restup import exceptions
+from restup.validation import ValidationPipeline
+
+from .base import ApiTestCase
+from .testapp.api import BookResource
+from .testapp.models import Author, Book
+
+
+class ValidationPipelineTests(ApiTestCase):
+
+    def pipeline(self, **fields):
+        schema = dict(BookResource.schema)
+        for key, field in fields.items():
+            schema[key] = dict(schema[key], **field)
+        return ValidationPipeline(tuple(schema.items()), Book)
+
+    def test_coerces_to_the_model_field_type(self):
+        cleaned = self.pipeline().validate({
+            'price': '9.99',
+            'published': '1937-09-21'
+        })
+        self.assertEqual(str(cleaned['price']), '9.99')
+        self.assertEqual(cleaned['published'].isoformat(), '1937-09-21')
+
+    def test_reports_every_invalid_field(self):
+        with self.assertRaises(exceptions.ValidationFailed) as raised:
+            self.pipeline().validate({'price': 'x', 'published': 'x'})
+        self.assertEqual(set(raised.exception.errors), {'price', 'published'})
+
+    def test_falsy_validator_result_fails(self):
+        pipeline = self.pipeline(title={
+            'validators': (lambda value: re.match(r'^[A-Z]', value),)
+        })
+        pipeline.validate({'title': 'Upper'})
+        with self.assertRaises(exceptions.ValidationFailed):
+            pipeline.validate({'title': 'lower'})
+
+    def test_validator_type_error_is_a_field_error(self):
+        pipeline = self.pipeline(published={
+            'validators': (lambda value: len(value) == 10,)
+        })
+        with self.assertRaises(exceptions.ValidationFailed) as raised:
+            pipeline.validate({'published': '1937-09-21'})
+        self.assertEqual(raised.exception.errors, {'published': "Invalid value."})
+
+    def test_related_uri_and_pk_are_accepted(self):
+        author = Author.objects.create(name='Tolkien')
+        pipeline = self.pipeline()
+        by_uri = pipeline.validate({'author': '/api/authors/{pk}/'.format(pk=author.pk)})
+        by_pk = pipeline.validate({'author': author.pk})
+        self.assertEqual(by_uri, {'author_id': author.pk})
+        self.assertEqual(by_pk, {'author_id': author.pk})
+
+    def test_related_to_field_resolves_the_instance(self):
+        author = Author.objects.create(name='Tolkien', code='jrrt')
+        cleaned = self.pipeline().validate({'editor': author.pk})
+        self.assertEqual(cleaned, {'editor': author})
+
+
+class CreateValidationTests(ApiTestCase):
+
+    def test_invalid_field_is_a_400_with_errors(self):
+        response = self.post('/api/books/', {'title': 'Hobbit', 'price': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json_data['errors'], {
+            'price': "Expected a decimal number."
+        })
+        self.assertFalse(Book.objects.exists())
+
+    def test_missing_related_object_is_a_field_error(self):
+        response = self.post('/api/books/', {'title': 'Hobbit', 'author': 99999})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json_data['errors'], {
+            'author': "Related object does not exist."
+        })
+
+    def test_bulk_checks_related_objects_in_one_query(self):
+        author = Author.objects.create(name='Tolkien')
+        payload = [
+            {'title': 'Hobbit', 'author': author.pk},
+            {'title': 'Silmarillion', 'author': 99999},
+            {'title': 'LOTR', 'author': author.pk},
+        ]
+        pipeline = BookResource.get_plan().pipeline
+        cleaned = [pipeline.clean(item)[0] for item in payload]
+        with self.assertNumQueries(1):
+            missing = pipeline.find_missing(cleaned)
+        self.assertEqual(missing, [
+            {}, {'author': "Related object does not exist."}, {}
+        ])
+        response = self.post('/api/books/', payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json_data['errors'], {
+            '1': {'author': "Related object does not exist."}
+        })
+        self.assertFalse(Book.objects.exists())
+
+    def test_bulk_create(self):
+        response = self.post('/api/books/', [{'title': 'Hobbit'}, {'title': 'LOTR'}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([obj['title'] for obj in response.json_data], ['Hobbit', 'LOTR'])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_data_is_valid_override_is_honoured(self):
+        class StrictBookResource(BookResource):
+            def data_is_valid(self):
+                return False
+
+        factory = RequestFactory()
+        book = Book.objects.create(title='Hobbit')
+        responses = [
+            StrictBookResource.as_list()(factory.post(
+                '/', '{"title": "New"}', content_type='application/json'
+            )),
+            StrictBookResource.as_detail()(factory.put(
+                '/', '{"title": "New"}', content_type='application/json'
+            ), pk=book.pk),
+        ]
+        self.assertEqual([r.status_code for r in responses], [400, 400])
+        self.assertEqual(Book.objects.get().title, 'Hobbit')
+
+    def test_update_validates(self):
+        book = Book.objects.create(title='Hobbit')
+        response = self.put('/api/books/{pk}/'.format(pk=book.pk), {'published': 'soon'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('published', response.json_data['errors'])
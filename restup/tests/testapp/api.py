@@ -0,0 +1,86 @@
+from restup import Api, ModelResource
+from restup.search import SqliteSearchBackend
+
+from .models import Author, Book, Tag
+
+
+api = Api()
+
+
+@api.register
+class AuthorResource(ModelResource):
+
+    model = Author
+
+    schema = {
+        'name': {
+            'attribute': 'name'
+        },
+        'code': {
+            'attribute': 'code'
+        },
+        'books': {
+            'attribute': 'books',
+            'writeable': False
+        }
+    }
+
+
+@api.register
+class TagResource(ModelResource):
+
+    model = Tag
+
+    schema = {
+        'name': {
+            'attribute': 'name'
+        }
+    }
+
+
+@api.register
+class BookResource(ModelResource):
+
+    model = Book
+
+    change_feed = True
+
+    search_backend_class = SqliteSearchBackend
+
+    list_fields = ('title', 'price', 'author')
+
+    schema = {
+        'title': {
+            'attribute': 'title',
+            'filters': ('exact', 'icontains'),
+            'sortable': True,
+            'search': 'A'
+        },
+        'description': {
+            'attribute': 'description',
+            'search': 'D'
+        },
+        'price': {
+            'attribute': 'price',
+            'sortable': True,
+            'aggregatable': True
+        },
+        'published': {
+            'attribute': 'published'
+        },
+        'genre': {
+            'attribute': 'genre',
+            'aggregatable': True
+        },
+        'author': {
+            'attribute': 'author',
+            'aggregatable': True
+        },
+        'editor': {
+            'attribute': 'editor'
+        },
+        'tags': {
+            'attribute': 'tags',
+            'writeable': False
+        }
+    }
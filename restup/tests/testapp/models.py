@@ -0,0 +1,70 @@
+from django.db import models
+
+
+class Author(models.Model):
+
+    name = models.CharField(
+        max_length=50
+    )
+
+    code = models.CharField(
+        max_length=10,
+        unique=True,
+        null=True
+    )
+
+
+class Tag(models.Model):
+
+    name = models.CharField(
+        max_length=20
+    )
+
+
+class Book(models.Model):
+
+    title = models.CharField(
+        max_length=100,
+        db_index=True
+    )
+
+    description = models.TextField(
+        default=''
+    )
+
+    price = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=0,
+        db_index=True
+    )
+
+    published = models.DateField(
+        null=True
+    )
+
+    genre = models.CharField(
+        max_length=20,
+        default='fiction'
+    )
+
+    author = models.ForeignKey(
+        Author,
+        null=True,
+        related_name='books',
+        on_delete=models.CASCADE
+    )
+
+    editor = models.ForeignKey(
+        Author,
+        null=True,
+        to_field='code',
+        db_index=False,
+        related_name='edited',
+        on_delete=models.CASCADE
+    )
+
+    tags = models.ManyToManyField(
+        Tag,
+        related_name='books'
+    )
@@ -0,0 +1,8 @@
+from django.conf.urls import url, include
+
+from .api import api
+
+
+urlpatterns = [
+    url(r'^api/', include(api.urls)),
+]
@@ -1,6 +1,14 @@
 import datetime
 import decimal
+import re
 import traceback
+from functools import lru_cache
+from urllib.parse import quote, urlparse
+
+from django.core.signals import setting_changed
+from django.core.urlresolvers import (reverse, resolve, get_script_prefix,
+                                      get_urlconf, NoReverseMatch, Resolver404)
+from django.dispatch import receiver
 
 try:
     import json
@@ -19,6 +27,93 @@ class ExtraJsonEncoder(json.JSONEncoder):
             return super(ExtraJsonEncoder, self).default(data)
 
 
+# A pk that any sane detail pattern will accept. It is swapped back out of
+# the reversed URI to leave a template that can be formatted per object.
+URI_PLACEHOLDER = '9081726354'
+
+# Keyed by the URLconf of the current request as well, which is None unless
+# a middleware set `request.urlconf`.
+_uri_templates = {}
+
+
+def cache_uri_template(viewname):
+    """
+    Reverses `viewname` once with a placeholder pk and caches the result as a
+    (head, tail) pair with the script prefix stripped off.
+
+    :param viewname: The name of a detail view taking a `pk` kwarg.
+    :type viewname: str
+
+    :return: The cached template or None if the pattern won't accept the
+    placeholder.
+    :type return: tuple
+    """
+    try:
+        uri = reverse(viewname, kwargs={'pk': URI_PLACEHOLDER})
+    except NoReverseMatch:
+        return None
+    prefix = get_script_prefix()
+    if uri.startswith(prefix):
+        uri = uri[len(prefix):]
+    head, _, tail = uri.rpartition(URI_PLACEHOLDER)
+    _uri_templates[get_urlconf(), viewname] = (head, tail)
+    return head, tail
+
+
+def reverse_detail_uri(viewname, pk):
+    """
+    Equivalent to reversing `viewname` with the given pk, but only hits the
+    URL resolver the first time a viewname is seen.
+
+    :param viewname: The name of a detail view taking a `pk` kwarg.
+    :type viewname: str
+
+    :param pk: The primary key of the object.
+
+    :return: The URI of the object.
+    :type return: str
+    """
+    key = get_urlconf(), viewname
+    template = _uri_templates.get(key)
+    if template is None and key not in _uri_templates:
+        template = cache_uri_template(viewname)
+        if template is None:
+            uri = reverse(viewname, kwargs={'pk': pk})
+            # The viewname exists, its pattern just can't be templated.
+            _uri_templates[key] = None
+            return uri
+    if template is None:
+        return reverse(viewname, kwargs={'pk': pk})
+    return "{prefix}{head}{pk}{tail}".format(
+        prefix=get_script_prefix(),
+        head=template[0],
+        pk=quote(str(pk), safe="/~:@!$&'()*+,;="),
+        tail=template[1]
+    )
+
+
+ETAG_MATCH = re.compile(r'(?:W/)?("[^"]*")')
+
+
+def etag_matches(etag, header):
+    """
+    Checks an ETag against an `If-None-Match` header. The header may list
+    several strong or weak ETags or be `*`, which matches anything.
+
+    :param etag: A quoted ETag, e.g. `'"abc"'`.
+    :type etag: str
+
+    :param header: The raw header value.
+    :type header: str
+
+    :return: True if `etag` matches the header.
+    :type return: bool
+    """
+    if header.strip() == '*':
+        return True
+    return etag in ETAG_MATCH.findall(header)
+
+
 def format_traceback(exc_info):
     stack = traceback.format_stack()
     stack = stack[:-2]
@@ -28,3 +123,39 @@ def format_traceback(exc_info):
     stack_str += "".join(stack)
     stack_str = stack_str[:-1]
     return stack_str
+
+
+@lru_cache(maxsize=2048)
+def _resolve_path(path, prefix, urlconf):
+    if path.startswith(prefix):
+        path = '/' + path[len(prefix):]
+    try:
+        match = resolve(path, urlconf)
+    except Resolver404:
+        return None
+    return match.url_name, match.kwargs.get('pk')
+
+
+def resolve_detail_uri(uri):
+    """
+    The inverse of `reverse_detail_uri`. Results are cached so resolving the
+    same related URI over and over only runs through the URL resolver once.
+
+    :param uri: A resource URI, e.g. `/api/books/1/`.
+    :type uri: str
+
+    :return: A (viewname, pk) pair or None if the URI doesn't resolve.
+    :type return: tuple
+    """
+    return _resolve_path(urlparse(uri).path, get_script_prefix(), get_urlconf())
+
+
+@receiver(setting_changed)
+def clear_uri_caches(setting, **kwargs):
+    """
+    Drops the cached URI templates and resolved URIs when the URLconf is
+    swapped, e.g. by `override_settings(ROOT_URLCONF=...)` in tests.
+    """
+    if setting == 'ROOT_URLCONF':
+        _uri_templates.clear()
+        _resolve_path.cache_clear()
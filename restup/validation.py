@@ -0,0 +1,321 @@
+import datetime
+import decimal
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+from . import exceptions
+from .utils import resolve_detail_uri
+
+
+def coerce_int(value):
+    if isinstance(value, bool):
+        raise ValueError("Expected an integer.")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError("Expected an integer.")
+
+
+def coerce_float(value):
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise ValueError("Expected a number.")
+
+
+def coerce_decimal(value):
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            return decimal.Decimal(str(value))
+        except decimal.InvalidOperation:
+            pass
+    raise ValueError("Expected a decimal number.")
+
+
+def coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    raise ValueError("Expected a boolean.")
+
+
+def coerce_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ValueError("Expected a UUID.")
+
+
+def _temporal_coercer(kind, parser, name):
+    def coerce(value):
+        if isinstance(value, kind):
+            return value
+        if isinstance(value, str):
+            try:
+                parsed = parser(value)
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                return parsed
+        raise ValueError("Expected an ISO 8601 {name}.".format(name=name))
+    return coerce
+
+
+coerce_datetime = _temporal_coercer(
+    datetime.datetime, parse_datetime, 'datetime'
+)
+coerce_date = _temporal_coercer(datetime.date, parse_date, 'date')
+coerce_time = _temporal_coercer(datetime.time, parse_time, 'time')
+
+
+# Checked in order, so subclasses have to come before their parents.
+COERCERS = (
+    (models.BooleanField, coerce_bool),
+    (models.NullBooleanField, coerce_bool),
+    (models.DateTimeField, coerce_datetime),
+    (models.DateField, coerce_date),
+    (models.TimeField, coerce_time),
+    (models.DecimalField, coerce_decimal),
+    (models.FloatField, coerce_float),
+    (models.AutoField, coerce_int),
+    (models.IntegerField, coerce_int),
+    (models.UUIDField, coerce_uuid),
+)
+
+
+def identity(value):
+    return value
+
+
+class RelatedCoercer(object):
+    """
+    Turns the `resource_uri` of a related object into its primary key. Plain
+    primary keys are accepted as well. If the relation points at the pk, the
+    existence of the object is checked by the `ValidationPipeline`, so that
+    bulk payloads need a single query per field.
+    """
+
+    def __init__(self, model_field):
+        self.related_model = model_field.related_model
+        self.pk_field = self.related_model._meta.pk
+        self.viewname = "api_{n}_detail".format(
+            n=self.related_model._meta.model_name
+        )
+        target = model_field.foreign_related_fields[0]
+        # Only assign the raw column if the relation points at the pk,
+        # otherwise we need the actual instance.
+        self.to_pk = target == self.pk_field
+
+    def __call__(self, value):
+        if isinstance(value, str):
+            resolved = resolve_detail_uri(value)
+            if resolved is None or resolved[0] != self.viewname:
+                raise ValueError("Expected a resource_uri of the {n} resource.".format(
+                    n=self.related_model._meta.model_name
+                ))
+            value = resolved[1]
+        try:
+            pk = self.pk_field.to_python(value)
+        except ValidationError:
+            raise ValueError("Invalid primary key.")
+        if self.to_pk:
+            return pk
+        try:
+            return self.related_model._default_manager.get(pk=pk)
+        except self.related_model.DoesNotExist:
+            raise ValueError("Related object does not exist.")
+
+
+class FieldPipeline(object):
+    """
+    Coerces and validates the incoming value of a single schema field.
+    """
+
+    def __init__(self, key, field, model):
+        self.key = key
+        self.target = field['attribute']
+        self.validators = tuple(field.get('validators', ()))
+        self.nullable = True
+        self.coerce = identity
+        try:
+            model_field = model._meta.get_field(field['attribute'])
+        except FieldDoesNotExist:
+            model_field = None
+        if 'coerce' in field:
+            self.coerce = field['coerce']
+        elif model_field is not None and model_field.concrete:
+            self.nullable = model_field.null
+            if isinstance(model_field, models.ForeignKey):
+                coercer = RelatedCoercer(model_field)
+                self.coerce = coercer
+                if coercer.to_pk:
+                    self.target = model_field.attname
+            else:
+                for field_class, coercer in COERCERS:
+                    if isinstance(model_field, field_class):
+                        self.coerce = coercer
+                        break
+
+    def clean(self, value):
+        """
+        :param value: The received value.
+
+        :return: The coerced value.
+
+        :raises ValueError: With a client facing message if the value is not
+        valid.
+        """
+        if value is None:
+            if not self.nullable:
+                raise ValueError("This field may not be null.")
+            return None
+        value = self.coerce(value)
+        for validator in self.validators:
+            try:
+                valid = validator(value)
+            except ValidationError as e:
+                raise ValueError(" ".join(e.messages))
+            except (TypeError, ValueError):
+                # Validators get the coerced value, which may not be the
+                # type they were written for.
+                raise ValueError("Invalid value.")
+            if not valid:
+                raise ValueError("Invalid value.")
+        return value
+
+
+class ValidationPipeline(object):
+    """
+    The compiled set of field pipelines for every writeable field in a
+    resource schema. Built once per resource class by its plan.
+    """
+
+    def __init__(self, fields, model):
+        self.fields = dict(
+            (key, FieldPipeline(key, field, model))
+            for key, field in fields
+            if field.get('writeable', True)
+        )
+        self.related = tuple(
+            pipeline for pipeline in self.fields.values()
+            if isinstance(pipeline.coerce, RelatedCoercer)
+            and pipeline.coerce.to_pk
+        )
+
+    def find_missing(self, items):
+        """
+        Checks that the objects that pk relations point at exist. Runs one
+        query per related field for all of `items`.
+
+        :param items: A list of dicts of model attributes to coerced values.
+        :type items: list
+
+        :return: A list of dicts of schema keys to error messages, one per
+        item.
+        :type return: list
+        """
+        missing = [dict() for item in items]
+        for pipeline in self.related:
+            target = pipeline.target
+            pks = set(
+                item[target] for item in items
+                if item.get(target) is not None
+            )
+            if not pks:
+                continue
+            found = set(
+                pipeline.coerce.related_model._default_manager.filter(
+                    pk__in=pks
+                ).values_list('pk', flat=True)
+            )
+            for index, item in enumerate(items):
+                pk = item.get(target)
+                if pk is not None and pk not in found:
+                    missing[index][pipeline.key] = "Related object does not exist."
+        return missing
+
+    def clean(self, data):
+        """
+        Runs every known key of `data` through its field pipeline. Unknown
+        and read only keys are ignored.
+
+        :param data: The deserialized request data.
+        :type data: dict
+
+        :return: A tuple of a dict of model attributes to coerced values and
+        a dict of schema keys to error messages.
+        :type return: tuple
+        """
+        cleaned = dict()
+        errors = dict()
+        if not isinstance(data, dict):
+            return cleaned, {'__all__': "Expected an object."}
+        fields = self.fields
+        for key, value in data.items():
+            pipeline = fields.get(key)
+            if pipeline is None:
+                continue
+            try:
+                cleaned[pipeline.target] = pipeline.clean(value)
+            except ValueError as e:
+                errors[key] = str(e)
+        return cleaned, errors
+
+    def validate(self, data):
+        """
+        :param data: The deserialized request data.
+        :type data: dict
+
+        :return: A dict of model attributes to coerced values.
+        :type return: dict
+
+        :raises ValidationFailed: If any field is invalid. All field errors
+        are reported at once.
+        """
+        cleaned, errors = self.clean(data)
+        if self.related:
+            errors.update(self.find_missing([cleaned])[0])
+        if errors:
+            raise exceptions.ValidationFailed(errors)
+        return cleaned
+
+    def validate_many(self, items):
+        """
+        Validates a list of objects, e.g. a bulk create payload.
+
+        :param items: A list of deserialized objects.
+        :type items: list
+
+        :return: A list of dicts of model attributes to coerced values.
+        :type return: list
+
+        :raises ValidationFailed: If any object is invalid. Errors are keyed
+        by the index of the object in the list.
+        """
+        clean = self.clean
+        cleaned_items = []
+        item_errors = []
+        for item in items:
+            cleaned, errors = clean(item)
+            cleaned_items.append(cleaned)
+            item_errors.append(errors)
+        if self.related:
+            for errors, missing in zip(item_errors, self.find_missing(cleaned_items)):
+                errors.update(missing)
+        errors = dict(
+            (str(index), errors)
+            for index, errors in enumerate(item_errors) if errors
+        )
+        if errors:
+            raise exceptions.ValidationFailed(errors)
+        return cleaned_items
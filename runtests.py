@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+import os
+import sys
+
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+
+if __name__ == '__main__':
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'restup.tests.settings'
+    django.setup()
+    TestRunner = get_runner(settings)
+    failures = TestRunner().run_tests(sys.argv[1:] or ['restup.tests'])
+    sys.exit(bool(failures))
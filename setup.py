@@ -44,6 +44,6 @@ setup(
     packages=find_packages(),
 
     install_requires=[
-        'django>=1.8'
+        'django>=1.9'
     ]
 )
\ No newline at end of file